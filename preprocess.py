@@ -1,74 +1,112 @@
 import re
 import sys
+
+import numpy as np
+from src.mesh_io import write_binary_mesh
 from src.parse_config import parse_yaml_config
+from src.section import section_diameters
+
+
+def bdf_fields(line):
+    """
+    按空白分割 BDF 行，去掉续行标记（以 `+` 开头的字段）。
+    """
+    return [part for part in re.split(r"\s+", line.strip()) if part and not part.startswith("+")]
+
+
+def read_bdf(geo_file):
+    """
+    读取 BDF 文件，返回杆件端点坐标、截面属性 id 以及截面外径。
+
+    杆件为 CBAR 与 CBEAM 单元，截面由 PBARL/PBEAML 给出。只有被单元引用的截面才换算外径，
+    未被引用的截面（如不支持的工字形、箱形截面）直接忽略。
+
+    :return (starts, ends, prop_ids, pbarl): pbarl 为 {属性id: 截面外径}
+    """
+    # 节点和截面信息存储
+    nodes = {}  # 存储节点信息: {id: (x, y, z)}
+    sections = {}  # 存储截面信息: {属性id: (截面类型, 尺寸)}
+    # 存储杆单元信息: [(起点id, 终点id, 属性id), ...]
+    cbars = []
+
+    # 读取几何文件并提取信息
+    with open(geo_file, "r") as f:
+        lines = f.readlines()
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+
+        # 提取节点 (GRID 数据)
+        if line.startswith("GRID"):
+            parts = re.split(r"\s+", line)
+            node_id = int(parts[1])
+            nodes[node_id] = (float(parts[2]), float(parts[3]), float(parts[4]))
+
+        # 提取杆单元 (CBAR/CBEAM 数据，字段均为 EID PID GA GB ...)
+        elif line.startswith(("CBAR", "CBEAM")):
+            parts = bdf_fields(line)
+            cbar_prop_id = int(parts[2])
+            node_id_start = int(parts[3])
+            node_id_end = int(parts[4])
+            cbars.append((node_id_start, node_id_end, cbar_prop_id))
+
+        # 提取PBARL/PBEAML数据，截面类型在本行最后，尺寸在下一行（忽略续行标记）
+        elif line.startswith(("PBARL", "PBEAML")):
+            parts = bdf_fields(line)
+            pbarl_id = int(parts[1])
+            section_type = parts[-1].upper()
+
+            next_line = lines[i + 1]  # 获取下一行
+            dims = [float(part) for part in bdf_fields(next_line)]
+            sections[pbarl_id] = (section_type, dims)
+
+    # 只换算被单元引用的截面，不支持的截面类型只在被引用时报错
+    pbarl = {}
+    for prop_id in sorted({prop_id for _, _, prop_id in cbars}):
+        if prop_id not in sections:
+            raise ValueError(f"Property {prop_id} is referenced by an element but has no PBARL/PBEAML card")
+        section_type, dims = sections[prop_id]
+        try:
+            pbarl[prop_id], _ = section_diameters(section_type, dims)
+        except ValueError as error:
+            raise ValueError(f"Property {prop_id}: {error}") from None
+
+    # 节点可能出现在杆单元之后，全部读完后再查找坐标
+    starts = np.array([nodes[start] for start, _, _ in cbars], dtype=float).reshape(-1, 3)
+    ends = np.array([nodes[end] for _, end, _ in cbars], dtype=float).reshape(-1, 3)
+    prop_ids = np.array([prop_id for _, _, prop_id in cbars], dtype=np.int64)
+    return starts, ends, prop_ids, pbarl
 
 
 def main(config_file):
 
-    config = parse_yaml_config("config.yaml")
-    water_depth_lst = config["wave"]["WATER_DEPTH"]
+    config = parse_yaml_config(config_file)
+    # 每个出现在算例中的水深各生成一个 Mesh 文件
+    water_depth_lst = sorted({case[2] for case in config["cases"]})
 
     GEO_FILE = config["geo"]["GEO_FILE"]
     base_name = GEO_FILE.split(".")[0]  # 使用 '.' 分割，取第一个部分
+    # text: 每个水深一个 .cy 文件；binary: 所有水深共用一个 .cyb 文件，水深在读取时平移
+    MESH_FORMAT = config["geo"].get("MESH_FORMAT", "text")
 
-    for WATER_DEPTH in water_depth_lst:
-        # 节点和截面信息存储
-        nodes = []  # 存储节点信息: [(id, x, y, z), ...]
-        pbarl = {}
-        # 存储截面信息: [(x_start, y_start, z_start, x_end, y_end, z_end), ...]
-        sections = []
-
-        # 读取几何文件并提取信息
-        with open(GEO_FILE, "r") as f:
-            lines = f.readlines()
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-
-            # 提取节点 (GRID 数据)
-            if line.startswith("GRID"):
-                parts = re.split(r"\s+", line)
-                node_id = int(parts[1])
-                x, y, z = float(parts[2]), float(parts[3]), float(parts[4])
-                nodes.append((node_id, x, y, z))
-
-            # 提取杆单元 (CBAR 数据)
-            elif line.startswith("CBAR"):
-                parts = re.split(r"\s+", line)
-                cbar_prop_id = int(parts[2])
-                node_id_start = int(parts[3])
-                node_id_end = int(parts[4])
-
-                # 查找节点坐标
-                start_coords = next(
-                    (x, y, z) for n_id, x, y, z in nodes if n_id == node_id_start
-                )
-                end_coords = next(
-                    (x, y, z) for n_id, x, y, z in nodes if n_id == node_id_end
-                )
-
-                sections.append((*start_coords, *end_coords, cbar_prop_id))
-            # 提取PBARL数据
-            elif line.startswith("PBARL"):  # 找到以 PBARL 开头的行
-                parts = re.split(r"\s+", line)
-                pbarl_id = int(parts[1])
-
-                next_line = lines[i + 1]  # 获取下一行
-                parts = re.split(r"\s+", next_line)
-                pbarl_radius = parts[1]
+    starts, ends, prop_ids, pbarl = read_bdf(GEO_FILE)
+    diameters = np.array([pbarl[prop_id] for prop_id in prop_ids], dtype=float)
 
-                pbarl[rf"{pbarl_id}"] = pbarl_radius  # 把属性id和截面半径存入字典
+    if MESH_FORMAT == "binary":
+        output_name = rf"{base_name}.cyb"
+        write_binary_mesh(output_name, starts, ends, diameters, prop_ids)
+        print(f"Mesh 文件已生成: {output_name}")
+        return
 
+    for WATER_DEPTH in water_depth_lst:
         output_name = rf"{base_name}D{WATER_DEPTH}.cy"
         # 写入输出文件
         with open(output_name, "w") as f:
             # 写入截面信息
-            f.write("# START(x,y,z) END(x,y,z) DIAMETER\n")
-            for section in sections:
-                diameter = float(pbarl[f"{section[6]}"]) * 2
+            f.write("# START(x,y,z) END(x,y,z) DIAMETER PROP_ID\n")
+            for start, end, diameter, prop_id in zip(starts, ends, diameters, prop_ids):
                 f.write(
-                    f"{section[0]} {section[1]} {
-                        section[2]+WATER_DEPTH} {section[3]} {section[4]} {section[5]+WATER_DEPTH} {diameter}\n"
+                    f"{start[0]} {start[1]} {start[2]+WATER_DEPTH} {end[0]} {end[1]} {end[2]+WATER_DEPTH} {diameter} {prop_id}\n"
                 )
 
         print(f"Mesh 文件已生成: {output_name}")
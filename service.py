@@ -0,0 +1,251 @@
+"""
+求解任务队列服务
+
+常驻的本地服务，通过 TCP 套接字接收 config 文件，按算例拆分后在有界的线程池中求解。
+- 相同的算例（所有影响结果的配置都相同）在所有任务之间只计算一次
+- 波浪对象与 Mesh 在任务之间共享缓存
+- 每个任务的结果写入 config 所在目录下的 `morison/<job_id>/`
+- 算例结果与任务状态都按最近使用淘汰，常驻运行时内存有界
+
+求解在线程池中进行，受 GIL 限制，纯 Python 的 `BACKEND: scalar` 几乎不能并行；
+`BACKEND: array` 的计算主要在 numpy 中完成，可以利用多个线程。
+
+协议为每行一个 JSON：
+    {"submit": "path/to/config.yaml"} -> {"job": "...", "cases": n}
+    {"status": "<job_id>"}            -> {"status": "running" | "done" | "failed", "reused": k, ...}
+
+`reused` 为该任务中直接取自算例缓存（已完成或正在计算）的算例数量。
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from solver import build_wave, collect_results, load_mesh, solve_case, write_results
+from src.parse_config import parse_yaml_config
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def digest(payload):
+    """
+    对配置片段做稳定的哈希，numpy 数组按列表处理。
+    """
+    text = json.dumps(payload, sort_keys=True, default=lambda value: np.asarray(value).tolist())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def mesh_source(config, water_depth, base_dir):
+    """
+    返回 Mesh 文件的绝对路径及修改时间，文件更新后缓存自动失效。
+    """
+    base_name = os.path.join(base_dir, config["geo"]["GEO_FILE"].split(".")[0])
+    if config["geo"].get("MESH_FORMAT", "text") == "binary":
+        file_path = os.path.abspath(rf"{base_name}.cyb")
+    else:
+        file_path = os.path.abspath(rf"{base_name}D{water_depth}.cy")
+    mtime = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+    return file_path, mtime
+
+
+class JobQueue:
+    """
+    在 asyncio 事件循环中调度求解任务。
+
+    所有缓存都保存 asyncio.Future，正在计算中的算例也能被其他任务复用。
+
+    Attributes:
+        executor (ThreadPoolExecutor): 有界的求解线程池
+        case_cache, wave_cache, mesh_cache (OrderedDict): 按最近使用淘汰的算例结果、波浪与 Mesh 缓存
+        jobs (OrderedDict): 任务 id -> 任务状态，超出上限时淘汰最早完成的任务
+        tasks (set): 正在运行的任务，asyncio 只弱引用任务，需在完成前持有引用
+    """
+
+    def __init__(self, max_workers=4, case_cache_size=256, wave_cache_size=64, mesh_cache_size=8,
+                 max_jobs=1024) -> None:
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.case_cache = OrderedDict()
+        self.wave_cache = OrderedDict()
+        self.mesh_cache = OrderedDict()
+        self.case_cache_size = case_cache_size
+        self.wave_cache_size = wave_cache_size
+        self.mesh_cache_size = mesh_cache_size
+        self.jobs = OrderedDict()
+        self.max_jobs = max_jobs
+        self.tasks = set()
+
+    async def _cached(self, cache, key, func, *args, max_size=None):
+        """
+        命中缓存时等待已有结果，否则在线程池中计算并放入缓存；计算失败的结果不缓存。
+        """
+        if key in cache:
+            if isinstance(cache, OrderedDict):
+                cache.move_to_end(key)
+            return await cache[key]
+
+        future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        cache[key] = future
+        if max_size is not None and len(cache) > max_size:
+            cache.popitem(last=False)
+        try:
+            return await future
+        except Exception:
+            if cache.get(key) is future:
+                del cache[key]
+            raise
+
+    @staticmethod
+    def case_keys(config, wave_case, base_dir):
+        """
+        计算一个算例的波浪、Mesh 与算例缓存键，所有影响结果的配置都参与哈希。
+        """
+        wave = config["wave"]
+        water_depth = wave_case[2]
+        source = mesh_source(config, water_depth, base_dir)
+
+        wave_key = digest([wave["WAVE_MODEL"], wave["WAVE_ORDER"], wave_case,
+                           config["solver"].get("KINEMATICS_TABLE")])
+        mesh_key = digest([source, water_depth, config["solver"]["MESH_RESOLUTION"],
+                           config["env"]["C_D"], config["env"]["C_M"], config.get("sections")])
+        case_key = digest([wave_key, mesh_key, config["env"], wave.get("HEADING"), config["solver"]])
+        return wave_key, mesh_key, case_key
+
+    async def solve(self, config, wave_case, base_dir):
+        """
+        求解一个波浪算例，依次复用算例、波浪与 Mesh 缓存。
+
+        :return (result, reused): `solve_case` 的结果，以及是否取自算例缓存
+        """
+        water_depth = wave_case[2]
+        wave_key, mesh_key, case_key = self.case_keys(config, wave_case, base_dir)
+
+        async def compute():
+            my_wave, mesh = await asyncio.gather(
+                self._cached(self.wave_cache, wave_key, build_wave, config, wave_case,
+                             max_size=self.wave_cache_size),
+                self._cached(self.mesh_cache, mesh_key, load_mesh, config, water_depth, base_dir,
+                             max_size=self.mesh_cache_size),
+            )
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, solve_case, config, wave_case, my_wave, mesh)
+
+        reused = case_key in self.case_cache
+        if reused:
+            self.case_cache.move_to_end(case_key)
+        else:
+            self.case_cache[case_key] = asyncio.ensure_future(compute())
+            if len(self.case_cache) > self.case_cache_size:
+                self.case_cache.popitem(last=False)
+        # 持有引用，计算中的算例被淘汰后仍能得到结果
+        future = self.case_cache[case_key]
+        try:
+            return await future, reused
+        except Exception:
+            if self.case_cache.get(case_key) is future:
+                del self.case_cache[case_key]
+            raise
+
+    def submit(self, config_file_path):
+        """
+        提交一个 config 文件，立即返回任务信息，求解在后台进行。
+        """
+        config_file_path = os.path.abspath(config_file_path)
+        config = parse_yaml_config(config_file_path)
+        # 服务在内存中保存并复用完整时程，分块计算请直接运行 solver.py
+        if config["solver"].get("TIME_CHUNK"):
+            raise ValueError("'solver.TIME_CHUNK' is not supported by the service, run solver.py instead")
+        base_dir = os.path.dirname(config_file_path)
+
+        job_id = uuid.uuid4().hex[:8]
+        job = {"status": "running", "done": 0, "total": len(config["cases"]), "reused": 0}
+        self.jobs[job_id] = job
+        # 只淘汰已结束的任务
+        finished = [key for key, value in self.jobs.items() if value["status"] != "running"]
+        for key in finished[:max(len(self.jobs) - self.max_jobs, 0)]:
+            del self.jobs[key]
+        task = asyncio.ensure_future(self.run_job(job_id, config, base_dir))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return {"job": job_id, "cases": job["total"]}
+
+    async def run_job(self, job_id, config, base_dir):
+        job = self.jobs[job_id]
+
+        async def tracked(wave_case):
+            result, reused = await self.solve(config, wave_case, base_dir)
+            job["done"] += 1
+            job["reused"] += reused
+            return result
+
+        try:
+            case_results = await asyncio.gather(*[tracked(case) for case in config["cases"]])
+            output_dir = os.path.join(base_dir, "morison", job_id)
+            await asyncio.get_running_loop().run_in_executor(
+                self.executor, write_results, output_dir,
+                *collect_results(case_results, config["case_weights"]))
+            job.update(status="done", output=output_dir)
+        except Exception as error:
+            job.update(status="failed", error=repr(error))
+
+    async def handle(self, reader, writer):
+        """
+        处理一个客户端连接，每行一个 JSON 请求。
+        """
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                if "submit" in request:
+                    response = self.submit(request["submit"])
+                elif "status" in request:
+                    response = self.jobs.get(request["status"], {"status": "unknown"})
+                else:
+                    response = {"error": f"Unknown request {request}"}
+            except Exception as error:
+                response = {"error": repr(error)}
+            writer.write((json.dumps(response) + "\n").encode("utf-8"))
+            await writer.drain()
+        writer.close()
+
+
+async def serve(max_workers):
+    queue = JobQueue(max_workers)
+    server = await asyncio.start_server(queue.handle, HOST, PORT)
+    print(f"Solver service listening on {HOST}:{PORT} with {max_workers} workers")
+    async with server:
+        await server.serve_forever()
+
+
+async def request(payload):
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    writer.write((json.dumps(payload) + "\n").encode("utf-8"))
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+if __name__ == "__main__":
+    usage = (
+        "使用方法:\n"
+        "  python service.py serve [max_workers]\n"
+        "  python service.py submit <config_file>\n"
+        "  python service.py status <job_id>"
+    )
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "submit", "status"):
+        print(usage)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "serve":
+        asyncio.run(serve(int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1))
+    elif len(sys.argv) != 3:
+        print(usage)
+        sys.exit(1)
+    else:
+        print(asyncio.run(request({command: sys.argv[2]})))
@@ -1,12 +1,23 @@
 import os
+import shutil
 import sys
 import time
+from contextlib import ExitStack
 import raschii
 import numpy as np
-from src.Cylinder import Cylinder
-from src.force_calculate import ForceCal
+from src.Cylinder import CylinderArray
+from src.force_calculate import ArrayForceCal, ForceCal
+from src.heading import heading_cylinders, stack_headings
+from src.kinematics_table import KinematicsTable
+from src.mesh_io import read_binary_mesh
 from src.Morison import Morsion
 from src.parse_config import parse_yaml_config
+from src.section import SectionTable
+from src.streaming import RunningStats, time_chunks
+from src.symmetry import PERIODIC_WAVE_MODELS, group_members, roll_sum
+
+# 合并时程文件时同时打开的文件数上限，低于 Windows C 运行库默认的 512
+MAX_OPEN_FILES = 256
 
 
 # 定义一个修饰器来计算和打印运行时间
@@ -23,95 +34,376 @@ def time_it(func):
 
 
 def read_mesh(file_path, resolution):
-    """Read the Mesh.cy file and create Cylinder objects."""
-    cylinders = []
-    with open(file_path, "r") as f:
-        for line in f.readlines():
-            if line.startswith("#") or not line:  # Skip comments and empty lines
-                continue
-            elif line.strip():  # Skip empty lines
-                start_x, start_y, start_z, end_x, end_y, end_z, diameter = map(
-                    float, line.split()
-                )
-                start = (start_x, start_y, start_z)
-                end = (end_x, end_y, end_z)
-                # Create Cylinder objects
-                cylinders.append(Cylinder(diameter, start, end, resolution))
-    return cylinders
+    """Read the Mesh.cy file into a CylinderArray."""
+    # 每行: START(x,y,z) END(x,y,z) DIAMETER [PROP_ID]，旧文件没有属性 id 列
+    table = np.loadtxt(file_path, comments="#", ndmin=2)
+    prop_ids = table[:, 7].astype(np.int64) if table.shape[1] > 7 else None
+    return CylinderArray(table[:, 6], table[:, 0:3], table[:, 3:6], resolution, prop_ids)
 
 
-@time_it
-def main(config_file_path):
-    config = parse_yaml_config("config.yaml")
+def select_members(morison, index):
+    """
+    取出部分杆件对应的 Morison 系数，标量系数保持不变。
+    """
+    def pick(coefficient):
+        return np.asarray(coefficient)[index] if np.ndim(coefficient) else coefficient
+    return Morsion(pick(morison.coefficient_drag), pick(morison.coefficient_mass))
 
-    C_D = config["env"]["C_D"]
-    C_M = config["env"]["C_M"]
-    RHO = config["env"]["RHO"]
 
-    GEO_FILE = config["geo"]["GEO_FILE"]
-    base_name = GEO_FILE.split(".")[0]  # 使用 '.' 分割，取第一个部分
+def repeat_members(morison, repeats):
+    """
+    把各杆件的 Morison 系数重复 `repeats` 次，与 `stack_headings` 拼接的杆件对应，标量系数保持不变。
+    """
+    def tile(coefficient):
+        return np.tile(coefficient, repeats) if np.ndim(coefficient) else coefficient
+    return Morsion(tile(morison.coefficient_drag), tile(morison.coefficient_mass))
+
+
+def cal_force_history(cylinders, wave, morison, rho, t_lst, backend="scalar"):
+    """
+    计算每根杆件在各时刻的x方向荷载及其对海床的倾覆力矩。
+
+    `backend` 为 `scalar` 时逐杆件、逐时刻使用 ForceCal；为 `array` 时用 ArrayForceCal
+    一次性计算所有杆件与时刻。
+
+    :return (force_history, moment_history): 形状均为 (杆件数, 时间步数)
+    """
+    if backend == "array":
+        my_force_cal = ArrayForceCal(cylinders, wave, morison, rho, np.asarray(t_lst))
+        return my_force_cal.cal_force_moment()
+
+    force_history = np.zeros((len(cylinders), len(t_lst)))
+    moment_history = np.zeros((len(cylinders), len(t_lst)))
+    for j, t in enumerate(t_lst):
+        for i, my_cylinder in enumerate(cylinders):
+            my_force_cal = ForceCal(my_cylinder, wave, select_members(morison, i), rho, t)
+            force_history[i, j] = my_force_cal.cal_force_x()
+            moment_history[i, j] = my_force_cal.cal_moment_y()
+    return force_history, moment_history
+
+
+def cal_group_force(cylinders, wave, morison, rho, t_lst, labels, deduplicate=False, backend="scalar"):
+    """
+    按组计算杆件x方向荷载之和及倾覆力矩之和的时程。
+
+    `deduplicate` 为真时，只计算每个等价类代表杆件的时程，x 方向间距恰为 `c*dt` 整数倍的
+    其余杆件由代表杆件的时程循环平移得到，`t_lst` 需等间距并覆盖整数个周期。不同组的杆件不会归为一类。
+
+    :param labels (np.ndarray): 各杆件所属组的序号，从 0 开始
+    :return (group_force, group_moment): 形状均为 (组数, 时间步数)
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    n_groups = labels.max() + 1 if len(labels) else 1
+
+    if not deduplicate:
+        group_force = np.zeros((n_groups, len(t_lst)))
+        group_moment = np.zeros((n_groups, len(t_lst)))
+        force_history, moment_history = cal_force_history(
+            cylinders, wave, morison, rho, t_lst, backend
+        )
+        np.add.at(group_force, labels, force_history)
+        np.add.at(group_moment, labels, moment_history)
+        return group_force, group_moment
+
+    classes = member_classes(cylinders, wave, morison, t_lst, labels)
+    rep_index = np.array([rep for rep, _, _ in classes])
+    rep_force, rep_moment = cal_force_history(
+        cylinders[rep_index], wave, select_members(morison, rep_index), rho, t_lst, backend
+    )
+    return rebuild_groups(classes, labels, n_groups, rep_force, rep_moment)
+
+
+def member_classes(cylinders, wave, morison, t_lst, labels):
+    """
+    划分去重计算的等价类，系数不同或所属组不同的杆件不会归为一类，见 `group_members`。
+
+    :param t_lst (np.ndarray): 等间距的时间点
+    :return member_classes (list): `group_members` 的返回值
+    """
+    keys = np.column_stack((
+        np.broadcast_to(morison.coefficient_drag, len(cylinders)),
+        np.broadcast_to(morison.coefficient_mass, len(cylinders)),
+        labels,
+    ))
+    time_step = (t_lst[-1] - t_lst[0]) / (len(t_lst) - 1)
+    return group_members(cylinders, wave.c * time_step, keys)
+
+
+def rebuild_groups(classes, labels, n_groups, rep_force, rep_moment):
+    """
+    由各类代表杆件的时程循环平移重构各组的荷载与力矩之和。
+
+    :param rep_force, rep_moment (np.ndarray): 代表杆件的时程，形状为 (类数, 时间步数)
+    :return (group_force, group_moment): 形状均为 (组数, 时间步数)
+    """
+    group_force = np.zeros((n_groups, rep_force.shape[1]))
+    group_moment = np.zeros((n_groups, rep_moment.shape[1]))
+    for force, moment, (rep, _, shifts) in zip(rep_force, rep_moment, classes):
+        group_force[labels[rep]] += roll_sum(force, shifts)
+        group_moment[labels[rep]] += roll_sum(moment, shifts)
+    return group_force, group_moment
+
+
+def report_deduplication(classes, n_members):
+    """
+    输出去重后实际计算的等价类数量以及减少的计算量。
+    """
+    print(
+        f"Deduplication: {len(classes)} classes for {n_members} members, "
+        f"{n_members / max(len(classes), 1):.1f}x fewer evaluations"
+    )
+
+
+def cal_total_force(cylinders, wave, morison, rho, t_lst, deduplicate=False, backend="scalar"):
+    """
+    计算所有杆件x方向荷载之和及倾覆力矩之和的时程，`deduplicate` 见 `cal_group_force`。
+
+    :return (total_force, total_moment): 长度均为时间步数
+    """
+    total_force, total_moment = cal_group_force(
+        cylinders, wave, morison, rho, t_lst, np.zeros(len(cylinders), dtype=np.int64), deduplicate, backend
+    )
+    return total_force[0], total_moment[0]
+
+
+def cal_heading_force(cylinders, wave, morison, rho, t_lst, headings, deduplicate=False, backend="scalar"):
+    """
+    计算各浪向下所有杆件x方向荷载之和及倾覆力矩之和的时程。
+
+    `backend` 为 `array` 时，所有浪向旋转后的杆件拼接为一个数组，一次性计算；
+    为 `scalar` 时逐浪向计算。
 
+    :param headings (np.ndarray): 浪向角（度）
+    :return (heading_force, heading_moment): 形状均为 (浪向数, 时间步数)
+    """
+    if backend == "scalar":
+        results = [
+            cal_total_force(heading_cylinder_lst, wave, morison, rho, t_lst, deduplicate, backend)
+            for heading_cylinder_lst in heading_cylinders(cylinders, headings)
+        ]
+        return np.array([force for force, _ in results]), np.array([moment for _, moment in results])
+
+    stacked, stacked_morison, labels = heading_members(cylinders, morison, headings)
+    return cal_group_force(stacked, wave, stacked_morison, rho, t_lst, labels, deduplicate, backend)
+
+
+def heading_members(cylinders, morison, headings):
+    """
+    把所有浪向旋转后的杆件拼接为一个数组，并给出对应的 Morison 系数与各杆件所属浪向的序号。
+
+    :return (stacked, stacked_morison, labels):
+    """
+    labels = np.repeat(np.arange(len(headings)), len(cylinders))
+    return stack_headings(cylinders, headings), repeat_members(morison, len(headings)), labels
+
+
+def build_wave(config, wave_case):
+    """
+    根据配置创建一个波浪算例的波浪对象，配置了插值表时返回 KinematicsTable。
+    """
     WAVE_MODEL = config["wave"]["WAVE_MODEL"]
     WAVE_ORDER = config["wave"]["WAVE_ORDER"]
-    WAVE_LENGTH_lst = config["wave"]["WAVE_LENGTH"]
-    WAVE_HEIGHT_lst = config["wave"]["WAVE_HEIGHT"]
-    WATER_DEPTH_lst = config["wave"]["WATER_DEPTH"]
-
-    wave_case_lst = [
-        (wave_length, wave_height, wave_depth)
-        for wave_length in WAVE_LENGTH_lst
-        for wave_height in WAVE_HEIGHT_lst
-        for wave_depth in WATER_DEPTH_lst
-    ]
+    # 可选的运动学插值表，如 {PHASE_RESOLUTION: 64, ELEVATION_RESOLUTION: 64, METHOD: "linear"}
+    KINEMATICS_TABLE = config["solver"].get("KINEMATICS_TABLE")
+
+    wave_length, wave_height, water_depth = wave_case
+
+    wave_model, _ = raschii.get_wave_model(WAVE_MODEL)
+    # Airy 模型不需要指定阶数，其他模型需要
+    if WAVE_MODEL == "Airy":
+        my_wave = wave_model(wave_height, water_depth, wave_length)
+    else:
+        my_wave = wave_model(wave_height, water_depth, wave_length, WAVE_ORDER)
 
+    if KINEMATICS_TABLE is not None:
+        my_wave = KinematicsTable(
+            my_wave,
+            KINEMATICS_TABLE.get("PHASE_RESOLUTION", 64),
+            KINEMATICS_TABLE.get("ELEVATION_RESOLUTION", 64),
+            KINEMATICS_TABLE.get("METHOD", "linear"),
+        )
+        print(
+            f"Kinematics table error: velocity {my_wave.velocity_error:.2e}, "
+            f"acceleration {my_wave.acceleration_error:.2e}"
+        )
+    return my_wave
+
+
+def load_mesh(config, water_depth, base_dir=""):
+    """
+    读取某一水深的 Mesh，并按截面属性计算水动力直径与系数。
+
+    :param base_dir (str): 几何文件路径的相对目录
+    :return (cylinders, morison):
+    """
+    C_D = config["env"]["C_D"]
+    C_M = config["env"]["C_M"]
+    GEO_FILE = config["geo"]["GEO_FILE"]
+    base_name = os.path.join(base_dir, GEO_FILE.split(".")[0])  # 使用 '.' 分割，取第一个部分
+    MESH_FORMAT = config["geo"].get("MESH_FORMAT", "text")
     MESH_RESOLUTION = config["solver"]["MESH_RESOLUTION"]
+
+    # Initialize Morison class
+    my_morison = Morsion(C_D, C_M)
+
+    # Read Mesh file and create the member table
+    if MESH_FORMAT == "binary":
+        cylinders = read_binary_mesh(rf"{base_name}.cyb", water_depth, MESH_RESOLUTION)
+    else:
+        geo_file_path = rf"{base_name}D{water_depth}.cy"
+        cylinders = read_mesh(geo_file_path, MESH_RESOLUTION)
+
+    # 每个 Mesh 只计算一次各杆件的水动力直径与系数，按属性 id 覆盖海生物、浮力模块及 C_D/C_M
+    if config.get("sections"):
+        cylinders, c_d, c_m = SectionTable(config["sections"], C_D, C_M).apply(cylinders)
+        my_morison = Morsion(c_d, c_m)
+    return cylinders, my_morison
+
+
+def time_grid(config, period):
+    """
+    时间轴覆盖 N_PERIODS 个周期，每个周期 TIME_RESOLUTION 个点（首尾相接）。
+
+    :return (end, num): 结束时间与时间点总数
+    """
     TIME_RESOLUTION = config["solver"]["TIME_RESOLUTION"]
+    N_PERIODS = config["solver"].get("N_PERIODS", 1)
+    return period * N_PERIODS, (TIME_RESOLUTION - 1) * N_PERIODS + 1
 
-    # Initialize wave model
-    temp_value_lst = []
-    case_name_lst = []
-    for i, wave_case in enumerate(wave_case_lst):
 
-        print(f"Progress: {i}/{len(wave_case_lst)}", end="\r")  # 打印计算进度
+def solve_case(config, wave_case, my_wave, mesh):
+    """
+    计算一个波浪算例在所有浪向下的荷载与倾覆力矩时程。
 
-        wave_length = wave_case[0]
-        wave_height = wave_case[1]
-        water_depth = wave_case[2]
+    :param wave_case (tuple): (波长, 波高, 水深)
+    :param my_wave: `build_wave` 返回的波浪对象
+    :param mesh (tuple): `load_mesh` 返回的 (cylinders, morison)
+    :return (t_lst, results): results 为 [(case_name, heading, force, moment), ...]
+    """
+    RHO = config["env"]["RHO"]
+    # 浪向角（度），未设置时只计算沿 +x 方向传播的波浪
+    HEADING_lst = np.atleast_1d(config["wave"].get("HEADING", 0.0))
+    HEADING_SWEEP = "HEADING" in config["wave"]
+    # 只有周期波浪的时间平移重构是精确的
+    DEDUPLICATE = config["solver"].get("DEDUPLICATE", False) and config["wave"]["WAVE_MODEL"] in PERIODIC_WAVE_MODELS
+    # 荷载计算方式：scalar 逐杆件计算，array 批量计算所有杆件与时刻
+    BACKEND = config["solver"].get("BACKEND", "scalar")
 
-        wave_model, _ = raschii.get_wave_model(WAVE_MODEL)
-        # Airy 模型不需要指定阶数，其他模型需要
-        if WAVE_MODEL == "Airy":
-            my_wave = wave_model(wave_height, water_depth, wave_length)
-        else:
-            my_wave = wave_model(wave_height, water_depth, wave_length, WAVE_ORDER)
+    wave_length, wave_height, water_depth = wave_case
+    period = my_wave.T
+    t_lst = np.linspace(0, *time_grid(config, period))
+    wave_case_name = rf"L{wave_length}H{wave_height}D{water_depth}T{period:.4f}"
 
-        period = my_wave.T
-        t_lst = np.linspace(0, period, TIME_RESOLUTION)
+    cylinders, my_morison = mesh
+    if DEDUPLICATE:
+        stacked, stacked_morison, labels = heading_members(cylinders, my_morison, HEADING_lst)
+        report_deduplication(member_classes(stacked, my_wave, stacked_morison, t_lst, labels), len(stacked))
+    # 所有浪向的杆件一次性旋转，对同一个波浪一起求解
+    heading_force, heading_moment = cal_heading_force(
+        cylinders, my_wave, my_morison, RHO, t_lst, HEADING_lst, DEDUPLICATE, BACKEND
+    )
+    results = []
+    for heading, val_lst, moment_lst in zip(HEADING_lst, heading_force, heading_moment):
+        case_name = wave_case_name
+        if HEADING_SWEEP:
+            case_name += rf"B{heading:g}"
+        results.append((case_name, heading, val_lst, moment_lst))
+    return t_lst, results
 
-        case_name = rf"L{wave_length}H{wave_height}D{water_depth}T{period:.4f}"
-        case_name_lst.append(case_name)
 
-        # Initialize Morison class
-        my_morison = Morsion(C_D, C_M)
+def stream_case(config, wave_case, my_wave, mesh, folder_path):
+    """
+    按 TIME_CHUNK 分块计算一个波浪算例，内存占用与时程长度无关。
 
-        # Read Mesh.cy file and create Cylinder objects
-        geo_file_path = rf"{base_name}D{water_depth}.cy"
+    每个浪向的时程逐块写入 `time_series/<case_name>.txt`，荷载与力矩的转折点写入
+    `turning_points/<case_name>_force.txt` 与 `turning_points/<case_name>_moment.txt`。
+    去重时先分块计算各等价类代表杆件一个周期的时程并合成，再按周期延拓到各块。
 
-        cylinders = read_mesh(geo_file_path, MESH_RESOLUTION)
+    :param folder_path (str): 结果文件夹
+    :return results: [(case_name, heading, series_path, force_stats, moment_stats), ...]
+    """
+    RHO = config["env"]["RHO"]
+    HEADING_lst = np.atleast_1d(config["wave"].get("HEADING", 0.0))
+    HEADING_SWEEP = "HEADING" in config["wave"]
+    TIME_RESOLUTION = config["solver"]["TIME_RESOLUTION"]
+    TIME_CHUNK = config["solver"]["TIME_CHUNK"]
+    DEDUPLICATE = config["solver"].get("DEDUPLICATE", False) and config["wave"]["WAVE_MODEL"] in PERIODIC_WAVE_MODELS
+    BACKEND = config["solver"].get("BACKEND", "scalar")
 
-        val_lst = []
-        for t in t_lst:
-            total_force = 0
-            for my_cylinder in cylinders:
-                my_force_cal = ForceCal(my_cylinder, my_wave, my_morison, RHO, t)
-                force = my_force_cal.cal_force_x()
-                total_force += force  # Accumulate the total force for all cylinders
-            val_lst.append(total_force)
-        normal_t_lst = t_lst  # 不直接写入
-        temp_value_lst.append(val_lst)
+    wave_length, wave_height, water_depth = wave_case
+    period = my_wave.T
+    end, num = time_grid(config, period)
+    wave_case_name = rf"L{wave_length}H{wave_height}D{water_depth}T{period:.4f}"
 
-    # 打开文件进行写入
-    folder_path = "morison"
+    series_folder = os.path.join(folder_path, "time_series")
+    turning_folder = os.path.join(folder_path, "turning_points")
+    os.makedirs(series_folder, exist_ok=True)
+    os.makedirs(turning_folder, exist_ok=True)
+
+    cylinders, my_morison = mesh
+    if DEDUPLICATE:
+        # 一个周期的合成时程，时间点都落在周期内的采样点上，延拓是精确的。
+        # 周期内的时间点同样按 TIME_CHUNK 分块计算，只保存各等价类代表杆件的时程
+        stacked, stacked_morison, labels = heading_members(cylinders, my_morison, HEADING_lst)
+        classes = member_classes(stacked, my_wave, stacked_morison, np.linspace(0, period, TIME_RESOLUTION), labels)
+        report_deduplication(classes, len(stacked))
+        rep_index = np.array([rep for rep, _, _ in classes])
+        rep_cylinders, rep_morison = stacked[rep_index], select_members(stacked_morison, rep_index)
+        rep_force = np.zeros((len(classes), TIME_RESOLUTION))
+        rep_moment = np.zeros((len(classes), TIME_RESOLUTION))
+        for index, t_lst in time_chunks(period, TIME_RESOLUTION, TIME_CHUNK):
+            rep_force[:, index], rep_moment[:, index] = cal_force_history(
+                rep_cylinders, my_wave, rep_morison, RHO, t_lst, BACKEND
+            )
+        period_force, period_moment = rebuild_groups(classes, labels, len(HEADING_lst), rep_force, rep_moment)
+
+    case_name_lst = [
+        wave_case_name + (rf"B{heading:g}" if HEADING_SWEEP else "") for heading in HEADING_lst
+    ]
+    stats = [(RunningStats(), RunningStats()) for _ in HEADING_lst]
+    series_path_lst = [os.path.join(series_folder, f"{case_name}.txt") for case_name in case_name_lst]
+    with ExitStack() as stack:
+        # 每个浪向三个文件：时程、荷载转折点、力矩转折点
+        files = []
+        for case_name, series_path in zip(case_name_lst, series_path_lst):
+            f = stack.enter_context(open(series_path, "w"))
+            f_force = stack.enter_context(open(os.path.join(turning_folder, f"{case_name}_force.txt"), "w"))
+            f_moment = stack.enter_context(open(os.path.join(turning_folder, f"{case_name}_moment.txt"), "w"))
+            f.write("#Time(s)\tForce(N)\tMoment(N*m)\n")
+            f_force.write("#Time(s)\tForce(N)\n")
+            f_moment.write("#Time(s)\tMoment(N*m)\n")
+            files.append((f, f_force, f_moment))
+
+        for index, t_lst in time_chunks(end, num, TIME_CHUNK):
+            if DEDUPLICATE:
+                heading_force = period_force[:, index % (TIME_RESOLUTION - 1)]
+                heading_moment = period_moment[:, index % (TIME_RESOLUTION - 1)]
+            else:
+                heading_force, heading_moment = cal_heading_force(
+                    cylinders, my_wave, my_morison, RHO, t_lst, HEADING_lst, False, BACKEND
+                )
+            for (f, f_force, f_moment), (force_stats, moment_stats), val_lst, moment_lst in zip(
+                files, stats, heading_force, heading_moment
+            ):
+                np.savetxt(f, np.column_stack((t_lst, val_lst, moment_lst)), fmt="%.5f", delimiter="\t")
+                np.savetxt(f_force, np.column_stack(force_stats.update(t_lst, val_lst)), fmt="%.5f", delimiter="\t")
+                np.savetxt(f_moment, np.column_stack(moment_stats.update(t_lst, moment_lst)), fmt="%.5f", delimiter="\t")
+
+        for (_, f_force, f_moment), (force_stats, moment_stats) in zip(files, stats):
+            np.savetxt(f_force, np.column_stack(force_stats.finalize()), fmt="%.5f", delimiter="\t")
+            np.savetxt(f_moment, np.column_stack(moment_stats.finalize()), fmt="%.5f", delimiter="\t")
+
+    return [
+        (case_name, heading, series_path, force_stats, moment_stats)
+        for case_name, heading, series_path, (force_stats, moment_stats)
+        in zip(case_name_lst, HEADING_lst, series_path_lst, stats)
+    ]
+
+
+def write_results(folder_path, t_lst, case_name_lst, temp_value_lst, weight_lst, envelope_lst):
+    """
+    写入荷载时程 `force_temporal.txt` 与各浪向峰值 `heading_envelope.txt`。
+    """
     file_path = os.path.join(folder_path, "force_temporal.txt")
 
     # 如果文件夹不存在，则创建文件夹
@@ -119,20 +411,10 @@ def main(config_file_path):
         os.makedirs(folder_path)
 
     with open(file_path, "w") as f:
-        # 写入列标题
-        f.write(
-            "#Casename\t"
-            + "\t".join([f"{case_name}" for case_name in case_name_lst])
-            + "\n"
-        )
-        f.write(
-            "#Time(s)\t"
-            + "\t".join([f"Force_{i+1}(N)" for i in range(len(temp_value_lst))])
-            + "\n"
-        )
+        write_temporal_header(f, case_name_lst, weight_lst)
 
         # 写入每一对 (t, val_lst) 数据
-        for i, t in enumerate(normal_t_lst):
+        for i, t in enumerate(t_lst):
             # 将时间点 t 和对应的 force 值逐列写入文件
             f.write(
                 f"{t:.5f}\t"
@@ -141,6 +423,169 @@ def main(config_file_path):
             )
 
     print(f"Data written to {file_path}")
+    write_envelope(folder_path, envelope_lst)
+
+
+def write_temporal_header(f, case_name_lst, weight_lst):
+    """
+    写入 `force_temporal.txt` 的列标题。
+    """
+    f.write(
+        "#Casename\t"
+        + "\t".join([f"{case_name}" for case_name in case_name_lst])
+        + "\n"
+    )
+    f.write(
+        "#Time(s)\t"
+        + "\t".join([f"Force_{i+1}(N)" for i in range(len(case_name_lst))])
+        + "\n"
+    )
+    if weight_lst:
+        f.write(
+            "#Probability\t"
+            + "\t".join([f"{weight:.6g}" for weight in weight_lst])
+            + "\n"
+        )
+
+
+def write_envelope(folder_path, envelope_lst):
+    """
+    写入各浪向的峰值荷载与倾覆力矩 `heading_envelope.txt`。
+    """
+    envelope_path = os.path.join(folder_path, "heading_envelope.txt")
+    with open(envelope_path, "w") as f:
+        f.write("#Casename\tHeading(deg)\tForce_max(N)\tMoment_max(N*m)\n")
+        for case_name, heading, force_max, moment_max in envelope_lst:
+            f.write(f"{case_name}\t{heading:.2f}\t{force_max:.5f}\t{moment_max:.5f}\n")
+
+    print(f"Data written to {envelope_path}")
+
+
+def write_stream_results(folder_path, case_results, case_weight_lst=None):
+    """
+    汇总分块计算的结果：写入各时程的统计量 `statistics.txt` 与 `heading_envelope.txt`，
+    并把各算例的时程文件逐行合并为 `force_temporal.txt`，合并时不读入完整时程。
+
+    :param case_results (list): 每个算例 `stream_case` 的返回值
+    """
+    rows = [
+        (i, *result) for i, results in enumerate(case_results) for result in results
+    ]
+    case_name_lst = [case_name for _, case_name, _, _, _, _ in rows]
+    weight_lst = [case_weight_lst[i] for i, *_ in rows] if case_weight_lst is not None else []
+
+    statistics_path = os.path.join(folder_path, "statistics.txt")
+    with open(statistics_path, "w") as f:
+        f.write(
+            "#Casename\tHeading(deg)\tForce_max(N)\tForce_min(N)\tForce_rms(N)\t"
+            "Moment_max(N*m)\tMoment_min(N*m)\tMoment_rms(N*m)\tTurning_points\n"
+        )
+        for _, case_name, heading, _, force_stats, moment_stats in rows:
+            f.write(
+                f"{case_name}\t{heading:.2f}\t{force_stats.max:.5f}\t{force_stats.min:.5f}\t"
+                f"{force_stats.rms:.5f}\t{moment_stats.max:.5f}\t{moment_stats.min:.5f}\t"
+                f"{moment_stats.rms:.5f}\t{force_stats.n_turning}\n"
+            )
+    print(f"Data written to {statistics_path}")
+
+    write_envelope(folder_path, [
+        (case_name, heading, force_stats.abs_max, moment_stats.abs_max)
+        for _, case_name, heading, _, force_stats, moment_stats in rows
+    ])
+
+    file_path = os.path.join(folder_path, "force_temporal.txt")
+    merge_time_series(
+        file_path, [series_path for _, _, _, series_path, _, _ in rows], case_name_lst, weight_lst
+    )
+    print(f"Data written to {file_path}")
+
+
+def merge_time_series(file_path, series_path_lst, case_name_lst, weight_lst, batch_size=MAX_OPEN_FILES):
+    """
+    把各时程文件的荷载列合并为 `force_temporal.txt`。
+
+    每次最多同时打开 `batch_size` 个时程文件，逐批把荷载列追加到已合并部分的每一行之后，
+    打开的文件数与内存占用都与算例数量无关。各时程文件的时间点数量相同，时间列取最后一个算例。
+    """
+    part_path = file_path + ".part"
+    next_path = file_path + ".next"
+    for start in range(0, len(series_path_lst), batch_size):
+        with ExitStack() as stack:
+            series_files = [
+                stack.enter_context(open(series_path))
+                for series_path in series_path_lst[start:start + batch_size]
+            ]
+            for series_file in series_files:
+                next(series_file)  # 跳过列标题
+            merged = stack.enter_context(open(part_path)) if start else None
+            with open(next_path, "w") as f:
+                for lines in zip(*series_files):
+                    columns = [line.rstrip("\n").split("\t") for line in lines]
+                    previous = merged.readline().rstrip("\n").split("\t")[1:] if merged else []
+                    f.write("\t".join([columns[-1][0], *previous, *(column[1] for column in columns)]) + "\n")
+        os.replace(next_path, part_path)
+
+    with open(file_path, "w") as f:
+        write_temporal_header(f, case_name_lst, weight_lst)
+        if os.path.exists(part_path):
+            with open(part_path) as part:
+                shutil.copyfileobj(part, f)
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+
+def collect_results(case_results, case_weight_lst=None):
+    """
+    把各算例的结果整理为 `write_results` 所需的列。
+
+    :param case_results (list): 每个算例的 (t_lst, results)
+    :return (t_lst, case_name_lst, temp_value_lst, weight_lst, envelope_lst):
+    """
+    temp_value_lst = []
+    case_name_lst = []
+    weight_lst = []
+    envelope_lst = []  # (case_name, heading, 最大荷载, 最大力矩)
+    normal_t_lst = []
+    for i, (t_lst, results) in enumerate(case_results):
+        for case_name, heading, val_lst, moment_lst in results:
+            case_name_lst.append(case_name)
+            if case_weight_lst is not None:
+                weight_lst.append(case_weight_lst[i])
+            temp_value_lst.append(val_lst)
+            envelope_lst.append(
+                (case_name, heading, np.max(np.abs(val_lst)), np.max(np.abs(moment_lst)))
+            )
+        normal_t_lst = t_lst  # 不直接写入
+    return normal_t_lst, case_name_lst, temp_value_lst, weight_lst, envelope_lst
+
+
+@time_it
+def main(config_file_path):
+    config = parse_yaml_config(config_file_path)
+
+    # 算例列表（网格、显式列表、散布图或采样），以及散布图给出的概率
+    wave_case_lst = config["cases"]
+    case_weight_lst = config["case_weights"]
+    # 设置了 TIME_CHUNK 时分块计算，时程直接写入文件
+    TIME_CHUNK = config["solver"].get("TIME_CHUNK")
+    folder_path = "morison"
+
+    case_results = []
+    for i, wave_case in enumerate(wave_case_lst):
+
+        print(f"Progress: {i}/{len(wave_case_lst)}", end="\r")  # 打印计算进度
+
+        my_wave = build_wave(config, wave_case)
+        mesh = load_mesh(config, wave_case[2])
+        if TIME_CHUNK:
+            case_results.append(stream_case(config, wave_case, my_wave, mesh, folder_path))
+        else:
+            case_results.append(solve_case(config, wave_case, my_wave, mesh))
+
+    if TIME_CHUNK:
+        write_stream_results(folder_path, case_results, case_weight_lst)
+    else:
+        write_results(folder_path, *collect_results(case_results, case_weight_lst))
 
 
 if __name__ == "__main__":
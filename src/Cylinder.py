@@ -16,18 +16,18 @@ class Cylinder:
         - :func:`discretize` : 根据杆件端点坐标离散。
     """
 
+    __slots__ = ("diameter", "start", "end", "resolution")
+
     def __init__(self, diameter: float, start=(float, float, float), end=(float, float, float), resolution=10) -> None:
         """
 
         """
         self.diameter = diameter
-        self.start = np.array(start)
-        self.end = np.array(end)
+        self.start = np.asarray(start, dtype=float)
+        self.end = np.asarray(end, dtype=float)
         self.resolution = resolution
-        try:
-            self.unit_vector()
-        except ValueError:
-            print("两个点坐标相同，请检查坐标输入")
+        if np.array_equal(self.start, self.end):
+            raise ValueError("两个点坐标相同，请检查坐标输入")
 
     def unit_volume(self) -> float:
         """
@@ -83,8 +83,107 @@ class Cylinder:
         """
         # 离散点直接通过插值
         step = np.linspace(0, 1, self.resolution)
-        points = np.array(
-            [self.start + s * (self.end - self.start) for s in step])
+        points = self.start + step[:, np.newaxis] * (self.end - self.start)
         distances = np.linalg.norm(np.diff(points, axis=0), axis=1)
 
         return points, distances
+
+
+class CylinderArray:
+    """
+    圆柱数组类，把所有杆件的直径与端点坐标存放在连续的 float64 数组中。
+
+    :params diameters (np.ndarray): 各杆件直径，形状为 (n,)
+    :params starts (np.ndarray): 各杆件起始点坐标，形状为 (n, 3)
+    :params ends (np.ndarray): 各杆件终点坐标，形状为 (n, 3)
+    :params resolution (int): 每根杆件的离散点数量
+    :params prop_ids (np.ndarray): 各杆件的截面属性 id，默认为 0
+    :params z_offset (float): 所有杆件 z 坐标的平移量（如水深），在离散时才加上，端点数组保持原样
+
+    Methods
+        - :func:`unit_volume`: 计算各杆件的单位体积。
+        - :func:`unit_area`: 计算各杆件的单位面积。
+        - :func:`unit_vector`: 计算各杆件从起始点到终点的单位矢量。
+        - :func:`discretize` : 一次性离散所有杆件。
+    """
+
+    __slots__ = ("diameters", "starts", "ends", "resolution", "prop_ids", "z_offset")
+
+    def __init__(self, diameters, starts, ends, resolution=10, prop_ids=None, z_offset=0.0) -> None:
+        self.diameters = np.ascontiguousarray(diameters, dtype=np.float64).reshape(-1)
+        self.starts = np.ascontiguousarray(starts, dtype=np.float64).reshape(-1, 3)
+        self.ends = np.ascontiguousarray(ends, dtype=np.float64).reshape(-1, 3)
+        self.resolution = resolution
+        if prop_ids is None:
+            prop_ids = np.zeros(len(self.diameters), dtype=np.int64)
+        self.prop_ids = np.ascontiguousarray(prop_ids, dtype=np.int64).reshape(-1)
+        self.z_offset = z_offset
+        if np.any(np.all(self.starts == self.ends, axis=1)):
+            raise ValueError("两个点坐标相同，请检查坐标输入")
+
+    @classmethod
+    def from_cylinders(cls, cylinders):
+        """
+        由 Cylinder 对象序列构造，离散点数量取第一根杆件的值。
+        """
+        cylinders = list(cylinders)
+        resolution = cylinders[0].resolution if cylinders else 10
+        return cls(
+            [cylinder.diameter for cylinder in cylinders],
+            [cylinder.start for cylinder in cylinders],
+            [cylinder.end for cylinder in cylinders],
+            resolution,
+        )
+
+    def __len__(self):
+        return len(self.diameters)
+
+    def __getitem__(self, index):
+        """
+        整数索引返回 Cylinder，切片或索引数组返回新的 CylinderArray。
+        """
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            shift = np.array([0.0, 0.0, self.z_offset])
+            return Cylinder(self.diameters[index], self.starts[index] + shift, self.ends[index] + shift,
+                            self.resolution)
+        return CylinderArray(self.diameters[index], self.starts[index], self.ends[index],
+                             self.resolution, self.prop_ids[index], self.z_offset)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def unit_volume(self) -> np.ndarray:
+        """
+        返回各杆件的单位体积，`V=pi*D^2/4`
+        """
+        return np.pi*self.diameters**2/4
+
+    def unit_area(self) -> np.ndarray:
+        """
+        返回各杆件的单位面积，`A=D`
+        """
+        return self.diameters
+
+    def unit_vector(self) -> np.ndarray:
+        """
+        计算各杆件的单位矢量，形状为 (n, 3)
+        """
+        vector = self.ends - self.starts
+        return vector / np.linalg.norm(vector, axis=1)[:, np.newaxis]
+
+    def discretize(self):
+        """
+        一次性离散所有杆件。
+
+        :return points (np.ndarray): 离散点坐标（已加上 `z_offset`），形状为 (n, resolution, 3)
+        :return distances (np.ndarray): 相邻离散点的距离，形状为 (n, resolution-1)
+        """
+        step = np.linspace(0, 1, self.resolution)
+        axis = self.ends - self.starts
+        points = self.starts[:, np.newaxis, :] + step[np.newaxis, :, np.newaxis] * axis[:, np.newaxis, :]
+        if self.z_offset:
+            points[:, :, 2] += self.z_offset
+        distances = np.outer(np.linalg.norm(axis, axis=1), np.diff(step))
+
+        return points, distances
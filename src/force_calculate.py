@@ -1,4 +1,5 @@
-from src.Cylinder import Cylinder
+import numpy as np
+from src.Cylinder import Cylinder, CylinderArray
 from src.Morison import Morsion
 
 
@@ -216,3 +217,149 @@ class ForceCal():
         froce_iner = self.sum(force_iner_lst)
 
         return force_drag + froce_iner
+
+    def cal_moment_y(self):
+        """
+        计算x方向荷载对海床（z=0）的倾覆力矩，`M_y = ∫ f_x z ds`
+
+        Returns:
+            (float)
+        """
+        vel_abs_lst = self.get_vel_abs()
+        vel_x_lst = self.get_vel_x()
+        acc_x_lst = self.get_acc_x()
+
+        def moment_expr(i):
+            force_drag = self.morison.force_drag(
+                self.rho, self.cylinder.unit_area(), vel_abs_lst[i], vel_x_lst[i])
+            force_iner = self.morison.force_inertial(
+                self.rho, self.cylinder.unit_volume(), acc_x_lst[i])
+            return (force_drag + force_iner) * self.points[i][2]
+
+        return self.sum(self.get_values_lst(moment_expr))
+
+
+class ArrayForceCal():
+    """
+    批量计算所有杆件荷载的类，公式与 ForceCal 逐点相同。
+
+    所有杆件的离散点一次性传给波浪对象计算运动学，再用数组运算得到各杆件的荷载。
+    `t` 可以是标量，也可以是一维时间数组；后者利用流场只依赖于 `x - c*t` 的性质，
+    把所有时刻合并为一次运动学调用。
+
+    Attributes:
+        cylinders (CylinderArray): 杆件数组
+        wave: 波浪对象，需提供 `velocity`、`acceleration`，时间数组还需提供相速度 `c`
+        morison (Morsion): Morison方程对象，系数可以是标量或与杆件一一对应的数组
+        rho (float): 水的密度，默认为1000.0 kg/m^3。
+        points (np.ndarray): 离散点坐标，形状为 (杆件数, 离散点数, 3)
+    """
+
+    def __init__(self, cylinders: CylinderArray, wave, morison: Morsion, rho=1000.0, t=0) -> None:
+        """
+        初始化类实例并一次性计算所有离散点的运动学。
+
+        Args:
+            cylinders (CylinderArray): 杆件数组
+            wave : 一个类的实例，包含波浪信息。
+            morison (Morsion): 一个 Morsion 类的实例，用于计算荷载。
+            rho (float): 水的密度（默认1000.0 kg/m^3）。
+            t (float | np.ndarray): 时刻或时间数组
+        """
+        self.cylinders = cylinders
+        self.wave = wave
+        self.rho = rho
+        self.t = t
+
+        # 方向分量形状为 (杆件数, 1[, 1])，与 (杆件数, 离散点数[, 时间数]) 的运动学广播
+        shape = (-1, 1) if np.ndim(t) == 0 else (-1, 1, 1)
+        # 系数可以是标量，也可以是与杆件一一对应的数组
+        self.morison = Morsion(np.reshape(morison.coefficient_drag, shape),
+                               np.reshape(morison.coefficient_mass, shape))
+        _unit_vector = self.cylinders.unit_vector()
+        self.e_x = _unit_vector[:, 0].reshape(shape)
+        self.e_y = _unit_vector[:, 1].reshape(shape)
+        self.e_z = _unit_vector[:, 2].reshape(shape)
+        self._shape = shape
+
+        self.points, self.distances = self.cylinders.discretize()
+        (self.water_u, self.water_w), (self.water_acc_x, self.water_acc_z) = self.get_kinematics()
+
+    def get_kinematics(self):
+        """
+        一次调用计算所有离散点（及所有时刻）的速度与加速度
+
+        Returns:
+            ((u, w), (a_x, a_z))，形状均为 (杆件数, 离散点数[, 时间数])
+        """
+        x = self.points[:, :, 0]
+        z = self.points[:, :, 2]
+        if np.ndim(self.t) == 0:
+            x_flat, z_flat, t = x.ravel(), z.ravel(), self.t
+        else:
+            x_flat = (x[:, :, np.newaxis] - self.wave.c * np.asarray(self.t)).ravel()
+            z_flat = np.broadcast_to(z[:, :, np.newaxis], (*z.shape, len(self.t))).ravel()
+            t = 0
+        shape = x.shape if np.ndim(self.t) == 0 else (*x.shape, len(self.t))
+
+        vel = np.asarray(self.wave.velocity(x_flat, z_flat, t))
+        acc = np.asarray(self.wave.acceleration(x_flat, z_flat, t))
+        return ((vel[:, 0].reshape(shape), vel[:, 1].reshape(shape)),
+                (acc[:, 0].reshape(shape), acc[:, 1].reshape(shape)))
+
+    def sum(self, values):
+        """
+        梯形法对传入的所有值沿着杆件求和，返回各杆件的积分值
+        """
+        distances = self.distances.reshape(*self.distances.shape, *([1] * (values.ndim - 2)))
+        return ((values[:, :-1] + values[:, 1:]) * distances / 2).sum(axis=1)
+
+    def get_force_x_lst(self):
+        """
+        各离散点处单位长度的阻力与惯性力
+
+        Returns:
+            (force_drag, force_iner)，形状均为 (杆件数, 离散点数[, 时间数])
+        """
+        vel_vector = self.e_x * self.water_u + self.e_z * self.water_w
+        vel_x = vel_vector
+        vel_y = -self.e_y * vel_vector
+        vel_z = self.water_w - self.e_z * vel_vector
+        vel_abs = (vel_x ** 2 + vel_y ** 2 + vel_z ** 2) ** 0.5
+        acc_x = (1 - self.e_x**2) * self.water_acc_x - self.e_z * self.e_x * self.water_acc_z
+
+        unit_area = self.cylinders.unit_area().reshape(self._shape)
+        unit_volume = self.cylinders.unit_volume().reshape(self._shape)
+        force_drag = self.morison.force_drag(self.rho, unit_area, vel_abs, vel_x)
+        force_iner = self.morison.force_inertial(self.rho, unit_volume, acc_x)
+        return force_drag, force_iner
+
+    def cal_force_x(self):
+        """
+        计算各杆件x方向的总荷载
+
+        Returns:
+            (np.ndarray): 形状为 (杆件数[, 时间数])
+        """
+        force_drag, force_iner = self.get_force_x_lst()
+        return self.sum(force_drag) + self.sum(force_iner)
+
+    def cal_moment_y(self):
+        """
+        计算各杆件x方向荷载对海床（z=0）的倾覆力矩
+
+        Returns:
+            (np.ndarray): 形状为 (杆件数[, 时间数])
+        """
+        return self.cal_force_moment()[1]
+
+    def cal_force_moment(self):
+        """
+        只计算一次各离散点的荷载，同时得到各杆件x方向的总荷载与倾覆力矩
+
+        Returns:
+            (force_x, moment_y)，形状均为 (杆件数[, 时间数])
+        """
+        force = np.add(*self.get_force_x_lst())
+        z = self.points[:, :, 2].reshape(*self.points.shape[:2], *([1] * (force.ndim - 2)))
+        return self.sum(force), self.sum(force * z)
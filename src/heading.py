@@ -0,0 +1,77 @@
+"""
+浪向扫描
+
+荷载计算中的波浪总是沿 +x 方向传播。对于浪向角 `heading`（自 +x 轴逆时针，单位：度），
+把杆件绕 z 轴旋转 `-heading`，使浪向与 +x 对齐，即可复用同一套运动学计算。
+"""
+import numpy as np
+from src.Cylinder import CylinderArray
+
+
+def rotation_matrices(headings):
+    """
+    生成把浪向旋转到 +x 方向的旋转矩阵。
+
+    :param headings (array_like): 浪向角（度）
+    :return R (np.ndarray): 形状为 (浪向数, 3, 3) 的旋转矩阵
+    """
+    theta = np.deg2rad(np.atleast_1d(np.asarray(headings, dtype=float)))
+    c, s = np.cos(theta), np.sin(theta)
+    R = np.zeros((len(theta), 3, 3))
+    R[:, 0, 0] = c
+    R[:, 0, 1] = s
+    R[:, 1, 0] = -s
+    R[:, 1, 1] = c
+    R[:, 2, 2] = 1.0
+    return R
+
+
+def rotate_members(starts, ends, headings):
+    """
+    一次性旋转所有杆件的端点到各个浪向对应的坐标系。
+
+    :param starts (np.ndarray): 起点坐标，形状为 (杆件数, 3)
+    :param ends (np.ndarray): 终点坐标，形状为 (杆件数, 3)
+    :param headings (array_like): 浪向角（度）
+    :return (rotated_starts, rotated_ends): 形状均为 (浪向数, 杆件数, 3)
+    """
+    R = rotation_matrices(headings)
+    rotated_starts = np.einsum("hij,nj->hni", R, starts)
+    rotated_ends = np.einsum("hij,nj->hni", R, ends)
+    return rotated_starts, rotated_ends
+
+
+def heading_cylinders(cylinders, headings):
+    """
+    为每个浪向生成旋转后的杆件数组。
+
+    :param cylinders (CylinderArray): 杆件数组
+    :return cylinders_by_heading (list): 与 `headings` 一一对应的 CylinderArray
+    """
+    rotated_starts, rotated_ends = rotate_members(cylinders.starts, cylinders.ends, headings)
+    return [
+        CylinderArray(cylinders.diameters, h_starts, h_ends, cylinders.resolution, cylinders.prop_ids,
+                      cylinders.z_offset)
+        for h_starts, h_ends in zip(rotated_starts, rotated_ends)
+    ]
+
+
+def stack_headings(cylinders, headings):
+    """
+    把所有浪向旋转后的杆件拼接为一个杆件数组，可一次性批量计算所有浪向。
+
+    第 h 个浪向的杆件位于 `h*N` 到 `(h+1)*N`，N 为原杆件数。
+
+    :param cylinders (CylinderArray): 杆件数组
+    :return stacked (CylinderArray): 共 `浪向数*N` 根杆件
+    """
+    rotated_starts, rotated_ends = rotate_members(cylinders.starts, cylinders.ends, headings)
+    n_headings = len(rotated_starts)
+    return CylinderArray(
+        np.tile(cylinders.diameters, n_headings),
+        rotated_starts.reshape(-1, 3),
+        rotated_ends.reshape(-1, 3),
+        cylinders.resolution,
+        np.tile(cylinders.prop_ids, n_headings),
+        cylinders.z_offset,
+    )
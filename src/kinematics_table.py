@@ -0,0 +1,128 @@
+"""
+按相位与高程分箱的波浪运动学插值表
+
+规则波的流场只依赖于相位 `k*(x - c*t)` 与高程 `z`。对每个波浪在 (相位 × 高程) 网格上
+计算一次速度和加速度，之后所有杆件离散点都通过插值取值，不再逐点调用 raschii。
+网格上使用延拓到自由面以上的流场，插值后再把波面以上的点置零，避免自由面处的间断污染插值。
+"""
+import inspect
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+
+def supports_keyword(func, name):
+    """
+    判断函数是否接受关键字参数 `name`（包括 `**kwargs`）。
+    """
+    try:
+        parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError):  # 无法获取签名的内置函数
+        return False
+    return name in parameters or any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values()
+    )
+
+
+class KinematicsTable:
+    """
+    波浪运动学插值表，接口与 raschii 波浪的 `velocity`、`acceleration` 一致，可直接替代波浪对象传给 ForceCal。
+    其他属性（如 `T`、`c`、`k`）转发给原波浪对象。
+
+    Attributes:
+        wave: raschii 波浪实例
+        phase_resolution (int): 一个周期内的相位网格数
+        elevation_resolution (int): 高程方向的网格数
+        method (str): 插值方法，`linear`（双线性）或 `cubic`（样条）
+        velocity_error (float): 速度插值的相对误差（最大误差 / 最大速度）
+        acceleration_error (float): 加速度插值的相对误差（最大误差 / 最大加速度）
+    """
+
+    def __init__(self, wave, phase_resolution=64, elevation_resolution=64, method="linear", z_range=None) -> None:
+        """
+        Args:
+            wave: raschii 波浪实例，需提供 `velocity` 与 `acceleration`
+            phase_resolution (int): 一个周期内的相位网格数
+            elevation_resolution (int): 高程方向的网格数
+            method (str): 插值方法，`linear` 或 `cubic`
+            z_range (tuple): 高程范围 (z_min, z_max)，默认从海床到波峰
+        """
+        self.wave = wave
+        self.phase_resolution = phase_resolution
+        self.elevation_resolution = elevation_resolution
+        self.method = method
+        if z_range is None:
+            z_range = (0.0, wave.depth + wave.height)
+        self.z_min, self.z_max = z_range
+
+        # 相位网格包含 0 与 2*pi 两端，保证周期插值连续
+        self.phase_grid = np.linspace(0, 2 * np.pi, phase_resolution + 1)
+        self.z_grid = np.linspace(self.z_min, self.z_max, elevation_resolution)
+
+        # 波面只是一维函数，用更密的网格制表，减少自由面附近点的误判
+        self.eta_phase_grid = np.linspace(0, 2 * np.pi, max(1024, 16 * phase_resolution) + 1)
+        self.eta_grid = np.asarray(wave.surface_elevation(self.eta_phase_grid / wave.k, 0))
+        self.eta_eps = getattr(wave, "eta_eps", 0.0)
+
+        x_mesh, z_mesh = np.meshgrid(self.phase_grid / wave.k, self.z_grid, indexing="ij")
+        self._vel_interp = self._build(wave.velocity, x_mesh, z_mesh)
+        self._acc_interp = self._build(wave.acceleration, x_mesh, z_mesh)
+
+        self.velocity_error, self.acceleration_error = self.interpolation_error()
+
+    def __getattr__(self, name):
+        if name == "wave":
+            raise AttributeError(name)
+        return getattr(self.wave, name)
+
+    def _build(self, func, x_mesh, z_mesh):
+        if supports_keyword(func, "all_points_wet"):
+            values = func(x_mesh.ravel(), z_mesh.ravel(), 0, all_points_wet=True)
+        else:  # 不支持 all_points_wet 的实现只能直接制表
+            values = func(x_mesh.ravel(), z_mesh.ravel(), 0)
+        values = np.asarray(values).reshape(*x_mesh.shape, 2)
+        values[-1] = values[0]
+        return RegularGridInterpolator((self.phase_grid, self.z_grid), values, method=self.method)
+
+    def _interpolate(self, interp, x, z, t):
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        z = np.atleast_1d(np.asarray(z, dtype=float))
+        phase = np.mod(self.wave.k * (x - self.wave.c * t), 2 * np.pi)
+        values = interp(np.column_stack((phase, np.clip(z, self.z_min, self.z_max))))
+
+        # 波面以上的点速度、加速度为零，与 raschii 的默认处理一致
+        eta = np.interp(phase, self.eta_phase_grid, self.eta_grid)
+        values[z > eta + self.eta_eps] = 0
+        return values
+
+    def velocity(self, x, z, t=0):
+        """
+        插值得到 (x, z) 处 t 时刻的水质点速度，返回形状为 (点数, 2)
+        """
+        return self._interpolate(self._vel_interp, x, z, t)
+
+    def acceleration(self, x, z, t=0):
+        """
+        插值得到 (x, z) 处 t 时刻的水质点加速度，返回形状为 (点数, 2)
+        """
+        return self._interpolate(self._acc_interp, x, z, t)
+
+    def interpolation_error(self):
+        """
+        在网格单元中心处与直接计算结果比较，估计插值误差。
+
+        :return (velocity_error, acceleration_error): 相对误差
+        """
+        phase_mid = (self.phase_grid[1:] + self.phase_grid[:-1]) / 2
+        z_mid = (self.z_grid[1:] + self.z_grid[:-1]) / 2
+        phase_mesh, z_mesh = np.meshgrid(phase_mid, z_mid, indexing="ij")
+        x = phase_mesh.ravel() / self.wave.k
+        z = z_mesh.ravel()
+
+        errors = []
+        for exact_func, interp_func in ((self.wave.velocity, self.velocity),
+                                        (self.wave.acceleration, self.acceleration)):
+            exact = np.asarray(exact_func(x, z, 0))
+            scale = np.max(np.abs(exact))
+            errors.append(np.max(np.abs(interp_func(x, z, 0) - exact)) / scale if scale > 0 else 0.0)
+        return tuple(errors)
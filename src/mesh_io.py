@@ -0,0 +1,93 @@
+"""
+二进制 Mesh 文件读写
+
+文件由固定长度的文件头和按列连续存放的杆件表组成，每一列都可通过 `np.memmap` 直接映射为
+连续数组，读取时不复制数据。杆件的 z 坐标以海床以下的 BDF 原始坐标保存，一个文件对应所有水深，
+水深作为 `CylinderArray.z_offset` 在离散时才加上。
+
+文件头（64 字节，小端）:
+    - magic (8 字节): `MORCYB\\0\\0`
+    - version (uint32)
+    - reserved (uint32)
+    - n_members (uint64)
+    - 其余填充为 0
+
+杆件表按列依次存放（n 为杆件数）:
+    - starts: n×3 float64
+    - ends: n×3 float64
+    - diameters: n float64
+    - prop_ids: n int64
+"""
+import struct
+
+import numpy as np
+from src.Cylinder import CylinderArray
+
+MAGIC = b"MORCYB\x00\x00"
+VERSION = 2
+HEADER_SIZE = 64
+HEADER_FORMAT = "<8sIIQ"
+# 列名 -> (数据类型, 每根杆件的元素数)
+COLUMNS = (
+    ("starts", "<f8", 3),
+    ("ends", "<f8", 3),
+    ("diameters", "<f8", 1),
+    ("prop_ids", "<i8", 1),
+)
+
+
+def write_binary_mesh(file_path, starts, ends, diameters, prop_ids):
+    """
+    写入二进制 Mesh 文件。
+
+    :param starts, ends (np.ndarray): 杆件端点坐标，形状为 (n, 3)
+    :param diameters (np.ndarray): 杆件直径
+    :param prop_ids (np.ndarray): 杆件的截面属性 id
+    """
+    values = {"starts": starts, "ends": ends, "diameters": diameters, "prop_ids": prop_ids}
+    n_members = len(diameters)
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, 0, n_members)
+    with open(file_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\x00"))
+        for name, dtype, width in COLUMNS:
+            np.ascontiguousarray(values[name], dtype=dtype).reshape(n_members * width).tofile(f)
+
+
+def open_binary_mesh(file_path):
+    """
+    以只读方式映射二进制 Mesh 文件的各列，不复制数据。
+
+    :return columns (dict): 列名 -> np.memmap，`starts`、`ends` 形状为 (n, 3)，其余为 (n,)
+    """
+    with open(file_path, "rb") as f:
+        magic, version, _, n_members = struct.unpack(
+            HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+    if magic != MAGIC:
+        raise ValueError(f"{file_path} is not a binary mesh file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary mesh version {version} in {file_path}, regenerate it with preprocess.py")
+
+    columns = {}
+    offset = HEADER_SIZE
+    for name, dtype, width in COLUMNS:
+        shape = (n_members, width) if width > 1 else (n_members,)
+        if n_members == 0:
+            columns[name] = np.zeros(shape, dtype=dtype)
+        else:
+            columns[name] = np.memmap(file_path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        offset += n_members * width * np.dtype(dtype).itemsize
+    return columns
+
+
+def read_binary_mesh(file_path, water_depth, resolution):
+    """
+    读取二进制 Mesh 文件，杆件数组直接引用映射的各列，水深作为 z 方向的平移量。
+
+    :param water_depth (float): 水深，离散时加到杆件的 z 坐标上
+    :param resolution (int): 每根杆件的离散点数量
+    :return cylinders (CylinderArray):
+    """
+    columns = open_binary_mesh(file_path)
+    return CylinderArray(columns["diameters"], columns["starts"], columns["ends"],
+                         resolution, columns["prop_ids"], water_depth)
@@ -1,21 +1,245 @@
+import numpy as np
 import yaml
 from numpy import linspace
+from scipy.optimize import brentq
+from scipy.stats import qmc
+from src.section import SECTION_KEYS
 
-def frange(start, end, step):
-    while start <= end:
-        yield round(start, 8)  # 避免浮点数累积误差
-        start += step
+# 各配置段允许出现的键，出现未知键时报错，避免拼写错误被静默忽略
+CONFIG_KEYS = {
+    "env": {"C_D", "C_M", "RHO"},
+    "geo": {"GEO_FILE", "MESH_FORMAT"},
+    "wave": {
+        "WAVE_MODEL", "WAVE_ORDER", "WAVE_LENGTH", "WAVE_HEIGHT", "WATER_DEPTH",
+        "HEADING", "CASES", "SCATTER", "SAMPLER",
+    },
+    "solver": {
+        "MESH_RESOLUTION", "TIME_RESOLUTION", "DEDUPLICATE", "KINEMATICS_TABLE", "BACKEND",
+        "TIME_CHUNK", "N_PERIODS",
+    },
+}
+RANGE_KEYS = {"start", "end", "n", "step"}
+BACKENDS = {"scalar", "array"}
+MESH_FORMATS = {"text", "binary"}
+SCATTER_KEYS = {"WATER_DEPTH", "TABLE"}
+SAMPLER_KEYS = {"METHOD", "N", "SEED"}
+KINEMATICS_TABLE_KEYS = {"PHASE_RESOLUTION", "ELEVATION_RESOLUTION", "METHOD"}
+INTERPOLATION_METHODS = {"linear", "cubic"}
+SAMPLERS = {"lhs": qmc.LatinHypercube, "sobol": qmc.Sobol, "halton": qmc.Halton}
+
+# 一个算例由 (波长, 波高, 水深) 确定
+WAVE_PARAMETERS = ("WAVE_LENGTH", "WAVE_HEIGHT", "WATER_DEPTH")
+
+
+def check_keys(section, keys, allowed):
+    unknown = set(keys) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown keys in '{section}': {sorted(unknown)}")
+
+
+def check_positive_int(name, value, minimum=1):
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise ValueError(f"'{name}' must be an integer >= {minimum}, got {value!r}")
+
+
+def check_range(name, value):
+    """
+    检查 `{start, end, n}` 或 `{start, end, step}` 形式的取值范围。
+    """
+    check_keys(name, value, RANGE_KEYS)
+    missing = {"start", "end"} - set(value)
+    if missing:
+        raise ValueError(f"'{name}' needs {sorted(missing)}")
+    if "n" in value and "step" in value:
+        raise ValueError(f"'{name}' accepts either 'n' or 'step', not both")
+    if "n" in value:
+        check_positive_int(f"{name}.n", value["n"])
+    if "step" in value:
+        if not value["step"] > 0:
+            raise ValueError(f"'{name}.step' must be positive, got {value['step']!r}")
+        if value["end"] < value["start"]:
+            raise ValueError(f"'{name}.end' must not be less than 'start' when 'step' is given")
+
+
+def validate_config(config):
+    """
+    检查配置中是否存在未知的配置段或键，以及取值是否有效。
+    """
+    check_keys("config", config, {*CONFIG_KEYS, "sections"})
+    for section, allowed in CONFIG_KEYS.items():
+        check_keys(section, config.get(section) or {}, allowed)
+    for prop_id, entry in (config.get("sections") or {}).items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"'sections.{prop_id}' must be a mapping of {sorted(SECTION_KEYS)}, got {entry!r}")
+        check_keys(f"sections.{prop_id}", entry, SECTION_KEYS)
+
+    backend = (config.get("solver") or {}).get("BACKEND", "scalar")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown solver backend '{backend}', available: {sorted(BACKENDS)}")
+
+    for key in ("TIME_CHUNK", "N_PERIODS"):
+        value = (config.get("solver") or {}).get(key)
+        if value is not None:
+            check_positive_int(f"solver.{key}", value)
+
+    table = (config.get("solver") or {}).get("KINEMATICS_TABLE")
+    if table is not None:
+        if not isinstance(table, dict):
+            raise ValueError(f"'solver.KINEMATICS_TABLE' must be a mapping of {sorted(KINEMATICS_TABLE_KEYS)}, got {table!r}")
+        check_keys("solver.KINEMATICS_TABLE", table, KINEMATICS_TABLE_KEYS)
+        for key in ("PHASE_RESOLUTION", "ELEVATION_RESOLUTION"):
+            if key in table:
+                check_positive_int(f"solver.KINEMATICS_TABLE.{key}", table[key], minimum=2)
+        if table.get("METHOD", "linear") not in INTERPOLATION_METHODS:
+            raise ValueError(
+                f"Unknown interpolation method '{table['METHOD']}', available: {sorted(INTERPOLATION_METHODS)}")
+
+    mesh_format = (config.get("geo") or {}).get("MESH_FORMAT", "text")
+    if mesh_format not in MESH_FORMATS:
+        raise ValueError(f"Unknown mesh format '{mesh_format}', available: {sorted(MESH_FORMATS)}")
+
+    wave = config.get("wave") or {}
+    for key in (*WAVE_PARAMETERS, "HEADING"):
+        if isinstance(wave.get(key), dict):
+            check_range(f"wave.{key}", wave[key])
+    if "SCATTER" in wave:
+        scatter = wave["SCATTER"]
+        check_keys("wave.SCATTER", scatter, SCATTER_KEYS)
+        if "TABLE" not in scatter:
+            raise ValueError("'wave.SCATTER' needs 'TABLE'")
+        if scatter.get("WATER_DEPTH", wave.get("WATER_DEPTH")) is None:
+            raise ValueError("'wave.SCATTER' needs 'WATER_DEPTH' in 'wave.SCATTER' or 'wave'")
+        if isinstance(scatter.get("WATER_DEPTH"), dict):
+            check_range("wave.SCATTER.WATER_DEPTH", scatter["WATER_DEPTH"])
+    if "SAMPLER" in wave:
+        check_keys("wave.SAMPLER", wave["SAMPLER"], SAMPLER_KEYS)
+        if "N" not in wave["SAMPLER"]:
+            raise ValueError("'wave.SAMPLER' needs 'N'")
+        check_positive_int("wave.SAMPLER.N", wave["SAMPLER"]["N"])
+    if sum(key in wave for key in ("CASES", "SCATTER", "SAMPLER")) > 1:
+        raise ValueError("Only one of 'wave.CASES', 'wave.SCATTER' and 'wave.SAMPLER' may be given")
+
+
+def expand_range(value):
+    """
+    将 `{start, end, n}` 或 `{start, end, step}` 展开为数值列表，标量转为单元素列表。
+    """
+    if isinstance(value, dict):
+        start, end = value["start"], value["end"]
+        if "step" in value:
+            step = value["step"]
+            # 按个数生成而不是逐次累加，避免浮点误差丢失终点；保留8位小数使算例名称整齐
+            n = int(np.floor((end - start) / step + 1e-9)) + 1
+            return np.round(start + step * np.arange(n), 8)
+        return linspace(start, end, value.get("n", 1))  # 默认为1
+    return np.atleast_1d(value)
+
+
+def wave_length_from_period(period, water_depth, g=9.81):
+    """
+    由线性色散关系 `omega^2 = g*k*tanh(k*d)` 求波长。
+    """
+    omega = 2 * np.pi / period
+    k_upper = 10 * (omega**2 / g + omega / np.sqrt(g * water_depth))  # 深水与浅水近似之和的10倍
+    k = brentq(lambda k: g * k * np.tanh(k * water_depth) - omega**2, 1e-12, k_upper)
+    return 2 * np.pi / k
+
+
+def grid_cases(wave):
+    return [
+        (float(wave_length), float(wave_height), float(water_depth))
+        for wave_length in expand_range(wave["WAVE_LENGTH"])
+        for wave_height in expand_range(wave["WAVE_HEIGHT"])
+        for water_depth in expand_range(wave["WATER_DEPTH"])
+    ]
+
+
+def list_cases(wave):
+    cases = []
+    for case in wave["CASES"]:
+        if isinstance(case, dict):
+            check_keys("wave.CASES", case, WAVE_PARAMETERS)
+            case = tuple(case[key] for key in WAVE_PARAMETERS)
+        if len(case) != len(WAVE_PARAMETERS):
+            raise ValueError(f"Each case needs {WAVE_PARAMETERS}, got {case}")
+        cases.append(tuple(float(value) for value in case))
+    return cases
+
+
+def scatter_cases(wave):
+    """
+    由 (Hs, Tp, 概率) 散布图生成算例，波高取 Hs，波长由 Tp 按线性色散关系换算。
+
+    :return (cases, weights):
+    """
+    scatter = wave["SCATTER"]
+    depths = expand_range(scatter.get("WATER_DEPTH", wave.get("WATER_DEPTH")))
+    cases, weights = [], []
+    for water_depth in depths:
+        for hs, tp, probability in scatter["TABLE"]:
+            wave_length = wave_length_from_period(tp, water_depth)
+            cases.append((round(wave_length, 4), float(hs), float(water_depth)))
+            weights.append(float(probability))
+    return cases, weights
+
+
+def sampled_cases(wave):
+    """
+    在 `{start, end}` 给定的参数范围内做空间填充采样，标量参数保持不变。
+    """
+    sampler = wave["SAMPLER"]
+    method = sampler.get("METHOD", "lhs").lower()
+    if method not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{method}', available: {sorted(SAMPLERS)}")
+
+    ranged = [key for key in WAVE_PARAMETERS if isinstance(wave[key], dict)]
+    if not ranged:
+        raise ValueError("'wave.SAMPLER' needs at least one parameter given as {start, end}")
+    for key in WAVE_PARAMETERS:
+        if key not in ranged and np.ndim(wave[key]) != 0:
+            raise ValueError(f"'wave.{key}' must be a scalar or {{start, end}} when sampling")
+
+    sample = SAMPLERS[method](d=len(ranged), seed=sampler.get("SEED")).random(sampler["N"])
+    lower = np.array([wave[key]["start"] for key in ranged], dtype=float)
+    upper = np.array([wave[key]["end"] for key in ranged], dtype=float)
+    sample = lower + sample * (upper - lower)
+
+    cases = []
+    for row in sample:
+        values = dict(zip(ranged, np.round(row, 4)))
+        cases.append(tuple(float(values.get(key, wave[key])) for key in WAVE_PARAMETERS))
+    return cases
+
+
+def build_wave_cases(wave):
+    """
+    根据波浪配置生成算例列表。
+
+    - `CASES`: 显式给出的 (波长, 波高, 水深) 列表
+    - `SCATTER`: (Hs, Tp, 概率) 散布图
+    - `SAMPLER`: 拉丁超立方（lhs）、Sobol 或 Halton 采样
+    - 以上都没有时，对各参数取笛卡尔积
+
+    :return (cases, weights): 算例列表与对应的概率，无概率时 weights 为 None
+    """
+    if "CASES" in wave:
+        return list_cases(wave), None
+    if "SCATTER" in wave:
+        return scatter_cases(wave)
+    if "SAMPLER" in wave:
+        return sampled_cases(wave), None
+    return grid_cases(wave), None
 
 
 def parse_yaml_config(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         config = yaml.safe_load(f)  # 使用 safe_load 来加载文件
 
-    # 处理配置中的 start, end, step 为列表的逻辑
+    validate_config(config)
+    config["cases"], config["case_weights"] = build_wave_cases(config["wave"])
+
+    # 处理配置中的 start, end, n/step 为列表的逻辑
     for key in config['wave']:
         if isinstance(config['wave'][key], dict) and 'start' in config['wave'][key]:
-            start = config['wave'][key]['start']
-            end = config['wave'][key]['end']
-            n = config['wave'][key].get('n', 1)  # 默认为1
-            config['wave'][key] =  linspace(start,end,n)
+            config['wave'][key] = expand_range(config['wave'][key])
     return config
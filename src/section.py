@@ -0,0 +1,115 @@
+"""
+截面属性
+
+- BDF 中 PBARL/PBEAML 截面尺寸到外径的换算
+- 按属性 id 索引的水动力属性表：海生物厚度、浮力模块等效直径以及 C_D/C_M 覆盖值
+"""
+import numpy as np
+from src.Cylinder import CylinderArray
+
+# 截面类型 -> 由尺寸 DIM1, DIM2, ... 计算 (外径, 内径)
+SECTION_TYPES = {
+    "ROD": lambda dims: (2 * dims[0], 0.0),  # DIM1: 半径
+    "TUBE": lambda dims: (2 * dims[0], 2 * dims[1]),  # DIM1: 外半径, DIM2: 内半径
+    "TUBE2": lambda dims: (2 * dims[0], 2 * (dims[0] - dims[1])),  # DIM1: 外半径, DIM2: 壁厚
+}
+
+# 配置文件 sections 段中每个属性 id 允许的键
+SECTION_KEYS = {"MARINE_GROWTH", "BUOYANCY_DIAMETER", "C_D", "C_M"}
+
+
+def section_diameters(section_type, dims):
+    """
+    由截面类型和尺寸计算外径与内径。
+
+    :param section_type (str): 截面类型，如 ROD、TUBE、TUBE2
+    :param dims (list): 截面尺寸 DIM1, DIM2, ...
+    :return (outer_diameter, inner_diameter):
+    """
+    if section_type not in SECTION_TYPES:
+        raise ValueError(
+            f"Unsupported section type '{section_type}', available: {sorted(SECTION_TYPES)}")
+    return SECTION_TYPES[section_type](dims)
+
+
+class SectionTable:
+    """
+    按属性 id 索引的水动力属性表，所有查询都对杆件数组整体进行。
+
+    水动力直径 `D_h = (BUOYANCY_DIAMETER 或 结构外径) + 2*MARINE_GROWTH`，`apply` 返回的杆件数组以 D_h 计算单位体积 `V = pi*D_h^2/4`。
+    未在表中出现的属性 id 使用结构外径与全局 C_D、C_M。
+
+    Attributes:
+        prop_ids (np.ndarray): 已排序的属性 id
+        marine_growth (np.ndarray): 海生物厚度
+        buoyancy_diameter (np.ndarray): 浮力模块等效直径，未设置为 NaN
+        c_d, c_m (np.ndarray): 拖曳力与惯性力系数
+    """
+
+    def __init__(self, sections=None, C_D=1.0, C_M=2.0) -> None:
+        """
+        Args:
+            sections (dict): {属性id: {MARINE_GROWTH, BUOYANCY_DIAMETER, C_D, C_M}}
+            C_D (float): 全局拖曳力系数
+            C_M (float): 全局惯性力系数
+        """
+        sections = sections or {}
+        self.C_D = C_D
+        self.C_M = C_M
+        self.prop_ids = np.array(sorted(int(prop_id) for prop_id in sections), dtype=np.int64)
+
+        entries = [sections.get(prop_id, sections.get(str(prop_id))) for prop_id in self.prop_ids]
+        self.marine_growth = np.array([entry.get("MARINE_GROWTH", 0.0) for entry in entries], dtype=float)
+        self.buoyancy_diameter = np.array(
+            [entry.get("BUOYANCY_DIAMETER", np.nan) for entry in entries], dtype=float)
+        self.c_d = np.array([entry.get("C_D", C_D) for entry in entries], dtype=float)
+        self.c_m = np.array([entry.get("C_M", C_M) for entry in entries], dtype=float)
+
+    def _lookup(self, prop_ids):
+        """
+        :return (index, found): 每个属性 id 在表中的位置，以及是否存在
+        """
+        prop_ids = np.asarray(prop_ids, dtype=np.int64)
+        index = np.clip(np.searchsorted(self.prop_ids, prop_ids), 0, max(len(self.prop_ids) - 1, 0))
+        found = self.prop_ids[index] == prop_ids if len(self.prop_ids) else np.zeros(prop_ids.shape, bool)
+        return index, found
+
+    def hydrodynamic_diameters(self, prop_ids, diameters):
+        """
+        各杆件的水动力直径。
+
+        :param prop_ids (np.ndarray): 各杆件的属性 id
+        :param diameters (np.ndarray): 各杆件的结构外径
+        """
+        diameters = np.asarray(diameters, dtype=float)
+        if not len(self.prop_ids):
+            return diameters.copy()
+        index, found = self._lookup(prop_ids)
+        buoyancy = np.where(found, self.buoyancy_diameter[index], np.nan)
+        base = np.where(np.isnan(buoyancy), diameters, buoyancy)
+        return base + 2 * np.where(found, self.marine_growth[index], 0.0)
+
+    def coefficients(self, prop_ids):
+        """
+        各杆件的拖曳力与惯性力系数。
+
+        :return (c_d, c_m): 与 `prop_ids` 等长的数组
+        """
+        prop_ids = np.asarray(prop_ids, dtype=np.int64)
+        if not len(self.prop_ids):
+            return np.full(prop_ids.shape, self.C_D, dtype=float), np.full(prop_ids.shape, self.C_M, dtype=float)
+        index, found = self._lookup(prop_ids)
+        return np.where(found, self.c_d[index], self.C_D), np.where(found, self.c_m[index], self.C_M)
+
+    def apply(self, cylinders: CylinderArray):
+        """
+        为整个杆件数组计算一次水动力直径与系数。
+
+        :return (hydro_cylinders, c_d, c_m): 直径替换为水动力直径的杆件数组，以及各杆件的系数
+        """
+        hydro_cylinders = CylinderArray(
+            self.hydrodynamic_diameters(cylinders.prop_ids, cylinders.diameters),
+            cylinders.starts, cylinders.ends, cylinders.resolution, cylinders.prop_ids, cylinders.z_offset,
+        )
+        c_d, c_m = self.coefficients(cylinders.prop_ids)
+        return hydro_cylinders, c_d, c_m
@@ -0,0 +1,110 @@
+"""
+分块时程计算
+
+长时程计算时不在内存中保存完整的时间序列：时间轴按块生成，每块算完后直接写入文件，
+同时增量更新最大值、最小值、均方根以及雨流计数所需的转折点，内存占用只与块大小有关。
+"""
+import numpy as np
+
+
+def time_chunks(end, num, chunk_size):
+    """
+    按块生成与 `np.linspace(0, end, num)` 完全相同的时间点。
+
+    :param end (float): 结束时间
+    :param num (int): 时间点总数
+    :param chunk_size (int): 每块的时间点数量
+    :return: 依次产生 `(index, t)`，index 为时间点在整个时间轴中的序号
+    """
+    step = end / (num - 1) if num > 1 else 0.0
+    for start in range(0, num, chunk_size):
+        index = np.arange(start, min(start + chunk_size, num))
+        t = index * step
+        if index[-1] == num - 1:
+            t[-1] = end  # 与 linspace 一致，终点精确等于 end
+        yield index, t
+
+
+class RunningStats:
+    """
+    单条时程的增量统计量。
+
+    转折点（峰、谷）跨块边界连续识别：每块的第一个点与上一块的最后一个点相连，
+    平台段取最后一个点。时程的起点与终点也作为转折点，可直接用于雨流计数。
+
+    Attributes:
+        count (int): 已处理的时间点数量
+        max, min (float): 最大值与最小值
+        sum_squares (float): 平方和
+        n_turning (int): 已识别的转折点数量
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.max = -np.inf
+        self.min = np.inf
+        self.sum_squares = 0.0
+        self.n_turning = 0
+        self._last = None  # 上一块最后一个点 (t, value)，尚未判断是否为转折点
+        self._direction = 0  # 最后一个非零增量的符号
+
+    @property
+    def rms(self):
+        return np.sqrt(self.sum_squares / self.count) if self.count else np.nan
+
+    @property
+    def abs_max(self):
+        return max(abs(self.max), abs(self.min))
+
+    def update(self, t, values):
+        """
+        加入一块时程。
+
+        :param t (np.ndarray): 本块的时间点
+        :param values (np.ndarray): 本块的时程值
+        :return (t_turning, turning): 本块新确认的转折点
+        """
+        t = np.asarray(t, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return np.zeros(0), np.zeros(0)
+
+        self.count += len(values)
+        self.max = max(self.max, values.max())
+        self.min = min(self.min, values.min())
+        self.sum_squares += np.dot(values, values)
+
+        if self._last is None:
+            # 起点总是转折点
+            turning_index = [np.array([0])]
+        else:
+            t = np.append(self._last[0], t)
+            values = np.append(self._last[1], values)
+            turning_index = []
+
+        signs = np.sign(np.diff(values))
+        nonzero = np.flatnonzero(signs)
+        if len(nonzero):
+            signs = signs[nonzero]
+            previous = np.append(self._direction, signs[:-1])
+            # 增量方向反转的位置，反转前一个点即为峰或谷
+            turning_index.append(nonzero[(signs != previous) & (previous != 0)])
+            self._direction = signs[-1]
+
+        self._last = (t[-1], values[-1])
+        index = np.concatenate(turning_index) if turning_index else np.zeros(0, dtype=int)
+        self.n_turning += len(index)
+        return t[index], values[index]
+
+    def finalize(self):
+        """
+        结束时程，终点作为最后一个转折点。
+
+        :return (t_turning, turning):
+        """
+        if self._last is None:
+            return np.zeros(0), np.zeros(0)
+        t_end, value_end = self._last
+        self._last = None
+        self.n_turning += 1
+        return np.array([t_end]), np.array([value_end])
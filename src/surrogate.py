@@ -0,0 +1,268 @@
+"""
+波浪参数空间上的峰值荷载代理模型
+
+用已完成的求解结果（`morison/force_temporal.txt`）训练 (波长, 波高, 水深) → 峰值荷载 的代理模型，
+支持高斯过程（GP）与多项式混沌展开（PCE），给出留一法交叉验证误差，并能在预测不确定性最大的位置
+建议新的求解算例。训练好的模型可对成批的参数点做向量化预测。
+"""
+import re
+
+import numpy as np
+from numpy.polynomial import legendre
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.stats import qmc
+
+CASE_PATTERN = re.compile(r"L([\d\.]+)H([\d\.]+)D([\d\.]+)T")
+
+
+def load_result_store(file_path):
+    """
+    读取 solver 输出的荷载时程，返回每个 (波长, 波高, 水深) 的峰值荷载。
+
+    同一波浪的多个浪向取包络，即所有浪向中荷载绝对值的最大值。
+
+    :param file_path (str): `force_temporal.txt` 的路径
+    :return (X, y): X 形状为 (算例数, 3)，y 为对应的峰值荷载
+    """
+    with open(file_path, "r") as f:
+        case_name_lst = re.split(r"\s+", f.readline().strip())[1:]
+    data = np.loadtxt(file_path, comments="#", ndmin=2)
+    peak_forces = np.max(np.abs(data[:, 1:]), axis=0)
+
+    envelope = {}
+    for case_name, peak_force in zip(case_name_lst, peak_forces):
+        match = CASE_PATTERN.match(case_name)
+        if match:
+            key = tuple(float(value) for value in match.groups())
+            envelope[key] = max(envelope.get(key, 0.0), peak_force)
+
+    X = np.array(list(envelope.keys()), dtype=float).reshape(-1, 3)
+    y = np.array(list(envelope.values()), dtype=float)
+    return X, y
+
+
+class Surrogate:
+    """
+    代理模型基类，负责把输入缩放到单位超立方体 [0, 1]^d，把输出标准化。
+
+    Attributes:
+        lower, upper (np.ndarray): 训练数据各维的取值范围
+        y_mean, y_std (float): 训练输出的均值与标准差
+    """
+
+    def _scale_x(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        span = np.where(self.upper > self.lower, self.upper - self.lower, 1.0)
+        return (X - self.lower) / span
+
+    def _set_scaling(self, X, y):
+        self.lower = X.min(axis=0)
+        self.upper = X.max(axis=0)
+        self.y_mean = y.mean()
+        self.y_std = y.std() if y.std() > 0 else 1.0
+
+
+class GaussianProcessSurrogate(Surrogate):
+    """
+    各向异性平方指数核的高斯过程回归，超参数通过最大化边缘似然确定。
+
+    Attributes:
+        length_scales (np.ndarray): 各维（缩放后）的相关长度
+        signal_std (float): 标准化输出的信号标准差
+        noise_std (float): 标准化输出的噪声标准差
+    """
+
+    def __init__(self, n_restarts=4, seed=0) -> None:
+        """
+        Args:
+            n_restarts (int): 超参数优化的随机初值个数
+            seed (int): 随机种子
+        """
+        self.n_restarts = n_restarts
+        self.seed = seed
+
+    def _kernel(self, A, B, length_scales, signal_std):
+        A = A / length_scales
+        B = B / length_scales
+        sq_dist = (A**2).sum(axis=1)[:, None] + (B**2).sum(axis=1)[None, :] - 2 * A @ B.T
+        return signal_std**2 * np.exp(-0.5 * np.maximum(sq_dist, 0))
+
+    def _neg_log_likelihood(self, log_params, X, y):
+        d = X.shape[1]
+        length_scales = np.exp(log_params[:d])
+        signal_std, noise_std = np.exp(log_params[d:])
+        K = self._kernel(X, X, length_scales, signal_std) + (noise_std**2 + 1e-10) * np.eye(len(X))
+        try:
+            factor = cho_factor(K, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e25
+        alpha = cho_solve(factor, y)
+        return 0.5 * y @ alpha + np.log(np.diag(factor[0])).sum() + 0.5 * len(X) * np.log(2 * np.pi)
+
+    def fit(self, X, y):
+        """
+        训练模型。
+
+        Args:
+            X (np.ndarray): 输入参数，形状为 (样本数, 维数)
+            y (np.ndarray): 峰值荷载
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._set_scaling(X, y)
+        self.X_train = self._scale_x(X)
+        self.y_train = (y - self.y_mean) / self.y_std
+
+        d = X.shape[1]
+        bounds = [(np.log(1e-2), np.log(1e2))] * d + [(np.log(1e-2), np.log(1e2)), (np.log(1e-6), np.log(1.0))]
+        rng = np.random.default_rng(self.seed)
+        starts = [np.r_[np.zeros(d), 0.0, np.log(1e-3)]]
+        starts += [rng.uniform(*np.array(bounds).T) for _ in range(self.n_restarts)]
+
+        best = min(
+            (minimize(self._neg_log_likelihood, start, args=(self.X_train, self.y_train),
+                      method="L-BFGS-B", bounds=bounds) for start in starts),
+            key=lambda result: result.fun,
+        )
+        self.length_scales = np.exp(best.x[:d])
+        self.signal_std, self.noise_std = np.exp(best.x[d:])
+        self._factorize()
+        return self
+
+    def _factorize(self):
+        K = self._kernel(self.X_train, self.X_train, self.length_scales, self.signal_std)
+        K += (self.noise_std**2 + 1e-10) * np.eye(len(self.X_train))
+        self._factor = cho_factor(K, lower=True)
+        self._alpha = cho_solve(self._factor, self.y_train)
+
+    def predict(self, X, return_std=False):
+        """
+        批量预测峰值荷载。
+
+        Args:
+            X (np.ndarray): 输入参数，形状为 (点数, 维数)
+            return_std (bool): 是否同时返回预测标准差
+
+        Returns:
+            mean 或 (mean, std)
+        """
+        K_star = self._kernel(self._scale_x(X), self.X_train, self.length_scales, self.signal_std)
+        mean = K_star @ self._alpha * self.y_std + self.y_mean
+        if not return_std:
+            return mean
+        v = cho_solve(self._factor, K_star.T)
+        var = np.maximum(self.signal_std**2 - np.einsum("ij,ji->i", K_star, v), 0)
+        return mean, np.sqrt(var) * self.y_std
+
+    def cross_validation_error(self):
+        """
+        解析形式的留一法交叉验证误差。
+
+        Returns:
+            (float): 留一预测误差的均方根，单位与荷载相同
+        """
+        K_inv = cho_solve(self._factor, np.eye(len(self.X_train)))
+        residuals = self._alpha / np.diag(K_inv)
+        return np.sqrt(np.mean(residuals**2)) * self.y_std
+
+
+class PolynomialChaosSurrogate(Surrogate):
+    """
+    基于 Legendre 多项式（均匀分布输入）的多项式混沌展开，总阶数截断，最小二乘求系数。
+
+    Attributes:
+        degree (int): 总阶数
+        multi_indices (np.ndarray): 各基函数在每一维上的阶数
+        coefficients (np.ndarray): 展开系数
+    """
+
+    def __init__(self, degree=3) -> None:
+        """
+        Args:
+            degree (int): 多项式总阶数
+        """
+        self.degree = degree
+
+    def _basis(self, X):
+        Z = 2 * self._scale_x(X) - 1  # Legendre 多项式定义在 [-1, 1]
+        Psi = np.ones((len(Z), len(self.multi_indices)))
+        for dim in range(Z.shape[1]):
+            values = legendre.legvander(Z[:, dim], self.degree)
+            Psi *= values[:, self.multi_indices[:, dim]]
+        return Psi
+
+    def fit(self, X, y):
+        """
+        训练模型。
+
+        Args:
+            X (np.ndarray): 输入参数，形状为 (样本数, 维数)
+            y (np.ndarray): 峰值荷载
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._set_scaling(X, y)
+        grids = np.meshgrid(*[np.arange(self.degree + 1)] * X.shape[1], indexing="ij")
+        indices = np.stack([grid.ravel() for grid in grids], axis=1)
+        self.multi_indices = indices[indices.sum(axis=1) <= self.degree]
+
+        Psi = self._basis(X)
+        y_scaled = (y - self.y_mean) / self.y_std
+        self.coefficients = np.linalg.lstsq(Psi, y_scaled, rcond=None)[0]
+
+        # 留一法误差：e_i = r_i / (1 - h_ii)
+        hat_diag = np.einsum("ij,ji->i", Psi, np.linalg.pinv(Psi))
+        residuals = (y_scaled - Psi @ self.coefficients) / np.maximum(1 - hat_diag, 1e-12)
+        self._loo_error = np.sqrt(np.mean(residuals**2)) * self.y_std
+        return self
+
+    def predict(self, X):
+        """
+        批量预测峰值荷载，输入形状为 (点数, 维数)。
+        """
+        return self._basis(X) @ self.coefficients * self.y_std + self.y_mean
+
+    def cross_validation_error(self):
+        """
+        留一法交叉验证误差的均方根，单位与荷载相同。
+        """
+        return self._loo_error
+
+
+def suggest_cases(surrogate, lower, upper, n, n_candidates=4096, seed=0):
+    """
+    自适应采样：在候选点中依次选出高斯过程预测标准差最大的点。
+
+    每选出一个点就把它以预测均值加入训练集（超参数不变），使后续选点避开已选位置。
+
+    :param surrogate (GaussianProcessSurrogate): 已训练的高斯过程模型
+    :param lower, upper (array_like): 参数范围
+    :param n (int): 建议的新算例数
+    :return cases (np.ndarray): 形状为 (n, 维数)
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    candidates = lower + qmc.LatinHypercube(d=len(lower), seed=seed).random(n_candidates) * (upper - lower)
+    X_train, y_train = surrogate.X_train, surrogate.y_train
+
+    cases = []
+    for _ in range(n):
+        _, std = surrogate.predict(candidates, return_std=True)
+        best = np.argmax(std)
+        cases.append(candidates[best])
+        y_believed = (surrogate.predict(candidates[best]) - surrogate.y_mean) / surrogate.y_std
+        surrogate.X_train = np.vstack([surrogate.X_train, surrogate._scale_x(candidates[best])])
+        surrogate.y_train = np.r_[surrogate.y_train, y_believed]
+        surrogate._factorize()
+        candidates = np.delete(candidates, best, axis=0)
+
+    surrogate.X_train, surrogate.y_train = X_train, y_train
+    surrogate._factorize()
+    return np.array(cases)
@@ -0,0 +1,65 @@
+"""
+杆件重复性识别与时间平移重构
+
+规则波（Airy、Stokes、Fenton）沿 +x 方向传播，流场只依赖于 `x - c*t` 与 `z`。
+因此两根直径、方向、高程都相同，只在 x、y 方向平移的杆件，所受荷载完全相同，
+仅在时间上相差 `dx/c`。只有当 `dx/c` 恰为时间步长的整数倍时，成员的时程才能由代表杆件的
+采样时程循环平移精确得到；其余杆件单独成类，直接计算。
+"""
+import numpy as np
+
+# 流场只依赖于 x - c*t 的周期波浪模型，对这些模型时间平移重构是精确的
+PERIODIC_WAVE_MODELS = ("Airy", "Fenton", "Stokes")
+
+
+def group_members(cylinders, x_step, extra_keys=None, decimals=6):
+    """
+    将杆件划分为等价类。
+
+    直径、起点高程以及轴向矢量 `end - start` 都相同，且 x 方向间距为 `x_step` 整数倍的杆件属于同一类，
+    与 y 方向的位置无关。杆件方向不做归一化，首尾互换的杆件不视为等价。
+
+    :param cylinders (CylinderArray): 杆件数组
+    :param x_step (float): 一个时间步内波浪传播的距离 `c*dt`
+    :param extra_keys (np.ndarray): 附加的分类依据，形状为 (杆件数, k)，如各杆件的 C_D、C_M
+    :param decimals (int): 比较坐标时保留的小数位数，用于消除浮点误差
+    :return member_classes (list): 每一类为 `(代表杆件序号, 成员序号数组, 成员相对代表杆件滞后的时间步数数组)`
+    """
+    x_start = cylinders.starts[:, 0]
+    steps = x_start / x_step
+    # 时间步数的小数部分相同的杆件之间才相差整数个时间步
+    residues = np.round(steps - np.floor(steps), decimals) % 1.0
+    keys = np.round(np.column_stack((
+        cylinders.diameters,
+        cylinders.starts[:, 2],
+        cylinders.ends - cylinders.starts,
+        np.zeros((len(cylinders), 0)) if extra_keys is None else extra_keys,
+    )), decimals)
+    keys = np.column_stack((keys, residues))
+    _, first, inverse, counts = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    # 按类别排序后切分，每类成员保持原有顺序
+    order = np.argsort(inverse.ravel(), kind="stable")
+    class_members = np.split(order, np.cumsum(counts)[:-1])
+
+    return [
+        (rep, members, np.round(steps[members] - steps[rep]).astype(np.int64))
+        for rep, members in zip(first, class_members)
+    ]
+
+
+def roll_sum(history, shifts):
+    """
+    对周期荷载时程做整数时间步的循环平移并求和，返回 `sum_m F(t - shifts[m]*dt)`，结果是精确的。
+
+    :param history (np.ndarray): 代表杆件整数个周期内的荷载时程，首尾两点对应同一相位
+    :param shifts (np.ndarray): 各成员相对代表杆件滞后的时间步数
+    :return shifted (np.ndarray): 与 `history` 等长的合成时程
+    """
+    samples = np.asarray(history, dtype=float)[:-1]
+    shift_values, counts = np.unique(np.asarray(shifts) % len(samples), return_counts=True)
+    shifted = np.zeros_like(samples)
+    for shift, count in zip(shift_values, counts):
+        shifted += count * np.roll(samples, shift)
+    return np.append(shifted, shifted[0])
@@ -0,0 +1,240 @@
+"""
+基准算例与参考荷载时程
+
+一组典型结构（单桩、斜撑、多杆件导管架、不等间距桩群、按整数时间步等距排列的框架）与波浪（Airy、Stokes、Fenton）的组合。
+参考时程由逐杆件、逐时刻的 `ForceCal` 计算并保存为 `.npz`，加速后的计算方式
+（批量、去重、插值表等）都与之对比，误差在容差以内才认为结果一致。
+"""
+import json
+import os
+
+import numpy as np
+import raschii
+from src.Cylinder import CylinderArray
+from src.force_calculate import ForceCal
+from src.Morison import Morsion
+
+WATER_DEPTH = 30.0
+RHO = 1000.0
+MESH_RESOLUTION = 10
+TIME_RESOLUTION = 41
+
+# 波浪名称 -> (波浪模型, 阶数, 波高, 波长)，Airy 不需要阶数
+WAVES = {
+    "Airy": ("Airy", None, 2.0, 60.0),
+    "Stokes": ("Stokes", 5, 3.0, 80.0),
+    "Fenton": ("Fenton", 10, 5.0, 100.0),
+}
+
+
+def pile(depth, x_step):
+    """
+    从海床伸出水面的竖直单桩。
+    """
+    return (np.array([1.5]), np.array([[0.0, 0.0, 0.0]]), np.array([[0.0, 0.0, depth + 8.0]])), 1.0, 2.0
+
+
+def braces(depth, x_step):
+    """
+    xz、yz 平面内的交叉斜撑以及一根空间斜撑，部分杆件穿过水面。
+    """
+    starts = np.array([
+        [-8.0, 0.0, 0.0], [8.0, 0.0, 0.0],
+        [0.0, -8.0, 0.5 * depth], [0.0, 8.0, 0.5 * depth],
+        [-5.0, -5.0, 5.0],
+    ])
+    ends = np.array([
+        [8.0, 0.0, 0.5 * depth], [-8.0, 0.0, 0.5 * depth],
+        [0.0, 8.0, depth + 6.0], [0.0, -8.0, depth + 6.0],
+        [5.0, 5.0, depth + 6.0],
+    ])
+    diameters = np.array([0.8, 0.8, 1.0, 1.0, 0.6])
+    return (diameters, starts, ends), 1.2, 1.8
+
+
+def jacket(depth, x_step, base=12.0, top=8.0, levels=(0.0, 0.3, 0.6, 0.9)):
+    """
+    四腿导管架：带斜度的桩腿，每层的水平撑以及各立面层间的 X 撑。
+
+    桩腿与撑杆使用不同的 C_D、C_M。
+    """
+    height = depth + 8.0
+    corners = np.array([[1, 1], [-1, 1], [-1, -1], [1, -1]], dtype=float)
+
+    def leg_point(leg, z):
+        half_width = base + (top - base) * z / height
+        return np.append(corners[leg] * half_width, z)
+
+    members = [(leg_point(leg, 0.0), leg_point(leg, height), 1.8, "leg") for leg in range(4)]
+    elevations = [fraction * depth for fraction in levels] + [depth + 4.0]
+    for k, z in enumerate(elevations):
+        for leg in range(4):
+            next_leg = (leg + 1) % 4
+            if k > 0:
+                members.append((leg_point(leg, z), leg_point(next_leg, z), 0.8, "brace"))
+            if k + 1 < len(elevations):
+                z_up = elevations[k + 1]
+                members.append((leg_point(leg, z), leg_point(next_leg, z_up), 0.6, "brace"))
+                members.append((leg_point(next_leg, z), leg_point(leg, z_up), 0.6, "brace"))
+
+    starts = np.array([start for start, _, _, _ in members])
+    ends = np.array([end for _, end, _, _ in members])
+    diameters = np.array([diameter for _, _, diameter, _ in members])
+    is_leg = np.array([kind == "leg" for _, _, _, kind in members])
+    return (diameters, starts, ends), np.where(is_leg, 1.0, 1.2), np.where(is_leg, 2.0, 1.8)
+
+
+def pile_group(depth, x_step, x_positions=(0.0, 7.3, 13.1, 21.7)):
+    """
+    沿 x 方向不等间距排列的相同桩与斜撑，去重时各成员相对代表杆件存在非整数时间步的相位差。
+    """
+    x_positions = np.asarray(x_positions)
+    zeros = np.zeros_like(x_positions)
+    starts = np.concatenate([
+        np.column_stack((x_positions, zeros, zeros)),
+        np.column_stack((x_positions, zeros + 4.0, zeros + 0.4 * depth)),
+    ])
+    ends = np.concatenate([
+        np.column_stack((x_positions, zeros, zeros + depth + 8.0)),
+        np.column_stack((x_positions + 3.0, zeros + 4.0, zeros + depth + 6.0)),
+    ])
+    diameters = np.concatenate([np.full(len(x_positions), 1.2), np.full(len(x_positions), 0.7)])
+    return (diameters, starts, ends), 1.0, 2.0
+
+
+def frame_row(depth, x_step, steps=(0, 3, 8, 13), y_positions=(0.0, 6.0, -4.0, 10.0)):
+    """
+    一排相同的框架（竖直桩加一根斜撑），x 方向间距恰为 `x_step` 的整数倍，y 方向位置各不相同。
+
+    去重时每类包含多个成员，由代表杆件的时程按非零的整数时间步循环平移重构。
+    """
+    x_positions = x_step * np.asarray(steps, dtype=float)
+    y_positions = np.asarray(y_positions)
+    zeros = np.zeros_like(x_positions)
+    starts = np.concatenate([
+        np.column_stack((x_positions, y_positions, zeros)),
+        np.column_stack((x_positions, y_positions, zeros + 0.3 * depth)),
+    ])
+    ends = np.concatenate([
+        np.column_stack((x_positions, y_positions, zeros + depth + 8.0)),
+        np.column_stack((x_positions + 4.0, y_positions + 2.0, zeros + depth + 6.0)),
+    ])
+    diameters = np.concatenate([np.full(len(x_positions), 1.2), np.full(len(x_positions), 0.7)])
+    return (diameters, starts, ends), 1.0, 2.0
+
+
+# 结构名称 -> 生成函数 f(水深, 一个时间步内波浪传播的距离 c*dt)
+STRUCTURES = {"pile": pile, "braces": braces, "jacket": jacket, "pile_group": pile_group, "frame_row": frame_row}
+
+# 基准算例名称 -> (结构, 波浪)
+CASES = {
+    f"{structure}-{wave}": (structure, wave)
+    for structure in STRUCTURES
+    for wave in WAVES
+}
+
+
+def canonical_case(case_name):
+    """
+    创建基准算例的杆件、Morison 系数与波浪。
+
+    :param case_name (str): `CASES` 中的算例名称，如 `jacket-Fenton`
+    :return (cylinders, morison, wave, t_lst):
+    """
+    if case_name not in CASES:
+        raise ValueError(f"Unknown verification case '{case_name}', available: {sorted(CASES)}")
+    structure, wave_name = CASES[case_name]
+
+    wave_model_name, wave_order, wave_height, wave_length = WAVES[wave_name]
+    wave_model, _ = raschii.get_wave_model(wave_model_name)
+    if wave_order is None:
+        wave = wave_model(wave_height, WATER_DEPTH, wave_length)
+    else:
+        wave = wave_model(wave_height, WATER_DEPTH, wave_length, wave_order)
+
+    t_lst = np.linspace(0, wave.T, TIME_RESOLUTION)
+    x_step = wave.c * wave.T / (TIME_RESOLUTION - 1)
+    (diameters, starts, ends), c_d, c_m = STRUCTURES[structure](WATER_DEPTH, x_step)
+    cylinders = CylinderArray(diameters, starts, ends, MESH_RESOLUTION)
+    return cylinders, Morsion(c_d, c_m), wave, t_lst
+
+
+def case_metadata(case_name):
+    """
+    参考文件中记录的算例定义，定义改变后旧的参考时程不能再使用。
+    """
+    structure, wave_name = CASES[case_name]
+    return {
+        "structure": structure,
+        "wave": list(WAVES[wave_name]),
+        "water_depth": WATER_DEPTH,
+        "rho": RHO,
+        "mesh_resolution": MESH_RESOLUTION,
+        "time_resolution": TIME_RESOLUTION,
+    }
+
+
+def reference_history(cylinders, wave, morison, rho, t_lst):
+    """
+    逐杆件、逐时刻用 `ForceCal` 计算总荷载与总倾覆力矩时程，作为参考结果。
+
+    :return (force, moment): 长度均为时间步数
+    """
+    c_d = np.broadcast_to(morison.coefficient_drag, len(cylinders))
+    c_m = np.broadcast_to(morison.coefficient_mass, len(cylinders))
+    force = np.zeros(len(t_lst))
+    moment = np.zeros(len(t_lst))
+    for j, t in enumerate(t_lst):
+        for i, cylinder in enumerate(cylinders):
+            force_cal = ForceCal(cylinder, wave, Morsion(c_d[i], c_m[i]), rho, t)
+            force[j] += force_cal.cal_force_x()
+            moment[j] += force_cal.cal_moment_y()
+    return force, moment
+
+
+def reference_path(folder_path, case_name):
+    return os.path.join(folder_path, f"{case_name}.npz")
+
+
+def save_reference(folder_path, case_name, t_lst, force, moment, elapsed):
+    """
+    保存参考时程及其计算耗时。
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    np.savez(
+        reference_path(folder_path, case_name),
+        t=t_lst, force=force, moment=moment, elapsed=elapsed,
+        metadata=json.dumps(case_metadata(case_name), sort_keys=True),
+    )
+
+
+def load_reference(folder_path, case_name):
+    """
+    读取参考时程，算例定义与保存时不同则报错。
+
+    :return (t_lst, force, moment, elapsed):
+    """
+    with np.load(reference_path(folder_path, case_name)) as data:
+        metadata = json.loads(str(data["metadata"]))
+        if metadata != json.loads(json.dumps(case_metadata(case_name), sort_keys=True)):
+            raise ValueError(f"Reference for '{case_name}' was generated from a different case definition, regenerate it")
+        return data["t"], data["force"], data["moment"], float(data["elapsed"])
+
+
+def relative_error(reference, candidate):
+    """
+    以参考时程的峰值归一化的最大偏差 `max|F - F_ref| / max|F_ref|`。
+    """
+    reference = np.asarray(reference)
+    scale = np.max(np.abs(reference))
+    error = np.max(np.abs(np.asarray(candidate) - reference))
+    return error / scale if scale > 0 else error
+
+
+def peak_error(reference, candidate):
+    """
+    峰值荷载的相对误差 `|max|F| - max|F_ref|| / max|F_ref|`。
+    """
+    reference_peak = np.max(np.abs(reference))
+    error = abs(np.max(np.abs(candidate)) - reference_peak)
+    return error / reference_peak if reference_peak > 0 else error
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import yaml
+from src.surrogate import (
+    GaussianProcessSurrogate,
+    PolynomialChaosSurrogate,
+    load_result_store,
+    suggest_cases,
+)
+
+
+def main(n_suggest):
+    file_path = os.path.join("morison", "force_temporal.txt")  # solver 的结果文件
+    output_path = os.path.join("morison", "suggested_cases.yaml")  # 建议补充的算例
+
+    X, y = load_result_store(file_path)
+    print(f"Loaded {len(y)} cases from {file_path}")
+
+    gp = GaussianProcessSurrogate().fit(X, y)
+    pce = PolynomialChaosSurrogate(degree=min(3, max(1, len(y) // 10))).fit(X, y)
+    print(f"GP  leave-one-out RMS error: {gp.cross_validation_error():.3f} N")
+    print(f"PCE leave-one-out RMS error: {pce.cross_validation_error():.3f} N")
+
+    # 在高斯过程预测不确定性最大的位置补充算例，可直接作为 config 中的 wave.CASES
+    cases = suggest_cases(gp, X.min(axis=0), X.max(axis=0), n_suggest)
+    with open(output_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"CASES": np.round(cases, 4).tolist()}, f)
+
+    print(f"Suggested cases have been written to {output_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("使用方法: python surrogate.py [n_suggest]")
+        sys.exit(1)
+
+    main(int(sys.argv[1]) if len(sys.argv) == 2 else 10)
@@ -0,0 +1,157 @@
+"""
+基准算例回归验证
+
+    python verify.py generate [case ...]   用逐杆件的 ForceCal 生成参考时程
+    python verify.py check [backend ...]   将各计算方式与参考时程对比，输出误差与耗时
+
+参考时程保存在 `verification/` 下，每个算例一个 `.npz` 文件。仓库中的参考时程由最初版本的
+ForceCal 生成，不指定算例时 `generate` 只补充缺失的参考时程，不覆盖已有文件。
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+import raschii
+from solver import cal_heading_force, cal_total_force, stream_case
+from src.kinematics_table import KinematicsTable
+from src.verification import (CASES, RHO, canonical_case, load_reference, peak_error,
+                              reference_history, reference_path, relative_error, save_reference)
+
+REFERENCE_FOLDER = "verification"
+
+
+def scalar(cylinders, wave, morison, rho, t_lst):
+    return cal_total_force(cylinders, wave, morison, rho, t_lst)
+
+
+def array(cylinders, wave, morison, rho, t_lst):
+    return cal_total_force(cylinders, wave, morison, rho, t_lst, backend="array")
+
+
+def deduplicate(cylinders, wave, morison, rho, t_lst):
+    return cal_total_force(cylinders, wave, morison, rho, t_lst, deduplicate=True, backend="array")
+
+
+def table(cylinders, wave, morison, rho, t_lst):
+    return cal_total_force(cylinders, KinematicsTable(wave), morison, rho, t_lst, backend="array")
+
+
+def heading(cylinders, wave, morison, rho, t_lst):
+    # 多个浪向拼接后一次性计算，取 0° 浪向
+    heading_force, heading_moment = cal_heading_force(
+        cylinders, wave, morison, rho, t_lst, [0.0, 90.0], backend="array"
+    )
+    return heading_force[0], heading_moment[0]
+
+
+def stream(cylinders, wave, morison, rho, t_lst, deduplicate=False, time_chunk=7):
+    """
+    按 `time_chunk` 分块计算并写入临时文件，再读回时程，不输出 `stream_case` 的提示信息。
+    """
+    config = {
+        "env": {"RHO": rho},
+        "wave": {"WAVE_MODEL": next(name for name, model in raschii.WAVE_MODELS.items() if isinstance(wave, model))},
+        "solver": {"TIME_RESOLUTION": len(t_lst), "TIME_CHUNK": time_chunk,
+                   "DEDUPLICATE": deduplicate, "BACKEND": "array"},
+    }
+    wave_case = (wave.length, wave.height, wave.depth)
+    with tempfile.TemporaryDirectory() as folder_path, redirect_stdout(io.StringIO()):
+        [(_, _, series_path, _, _)] = stream_case(config, wave_case, wave, (cylinders, morison), folder_path)
+        series = np.loadtxt(series_path)
+    return series[:, 1], series[:, 2]
+
+
+def stream_deduplicate(cylinders, wave, morison, rho, t_lst):
+    return stream(cylinders, wave, morison, rho, t_lst, deduplicate=True)
+
+
+# 计算方式 -> (计算函数, 时程误差容差, 峰值误差容差)
+BACKENDS = {
+    "scalar": (scalar, 1e-10, 1e-10),
+    "array": (array, 1e-8, 1e-8),
+    "dedup": (deduplicate, 1e-8, 1e-8),
+    "table": (table, 5e-3, 5e-3),
+    "heading": (heading, 1e-8, 1e-8),
+    # 时程文件保留5位小数
+    "stream": (stream, 1e-8, 1e-8),
+    "stream_dedup": (stream_deduplicate, 1e-8, 1e-8),
+}
+
+
+def generate(case_name_lst):
+    for case_name in case_name_lst:
+        if case_name_lst is CASES and os.path.exists(reference_path(REFERENCE_FOLDER, case_name)):
+            continue  # 已有的参考时程不覆盖
+        cylinders, morison, wave, t_lst = canonical_case(case_name)
+        start_time = time.perf_counter()
+        force, moment = reference_history(cylinders, wave, morison, RHO, t_lst)
+        elapsed = time.perf_counter() - start_time
+        save_reference(REFERENCE_FOLDER, case_name, t_lst, force, moment, elapsed)
+        print(f"Reference written for {case_name} ({len(cylinders)} members, {elapsed:.2f} s)")
+
+
+def check(backend_lst):
+    """
+    :return passed (bool): 所有算例与计算方式都在容差以内
+    """
+    print(
+        f"{'Case':<20}{'Backend':<14}{'Force err':>12}{'Moment err':>12}{'Peak err':>12}"
+        f"{'Tolerance':>20}{'Ref(s)':>10}{'Time(s)':>10}{'Speedup':>10}  Result"
+    )
+    passed = True
+    for case_name in CASES:
+        try:
+            t_lst, force_ref, moment_ref, reference_time = load_reference(REFERENCE_FOLDER, case_name)
+        except (OSError, ValueError) as error:
+            print(f"{case_name:<20}{'-':<14}reference unavailable: {error}  FAIL")
+            passed = False
+            continue
+        cylinders, morison, wave, _ = canonical_case(case_name)
+
+        for backend in backend_lst:
+            func, history_tolerance, peak_tolerance = BACKENDS[backend]
+            start_time = time.perf_counter()
+            force, moment = func(cylinders, wave, morison, RHO, t_lst)
+            elapsed = time.perf_counter() - start_time
+
+            force_error = relative_error(force_ref, force)
+            moment_error = relative_error(moment_ref, moment)
+            peak = max(peak_error(force_ref, force), peak_error(moment_ref, moment))
+            ok = max(force_error, moment_error) <= history_tolerance and peak <= peak_tolerance
+            passed = passed and ok
+            print(
+                f"{case_name:<20}{backend:<14}{force_error:>12.2e}{moment_error:>12.2e}{peak:>12.2e}"
+                f"{f'{history_tolerance:.0e} / {peak_tolerance:.0e}':>20}"
+                f"{reference_time:>10.3f}{elapsed:>10.3f}{reference_time / elapsed:>9.1f}x  "
+                f"{'PASS' if ok else 'FAIL'}"
+            )
+    return passed
+
+
+if __name__ == "__main__":
+    usage = (
+        "使用方法:\n"
+        "  python verify.py generate [case ...]\n"
+        "  python verify.py check [backend ...]\n"
+        f"算例: {', '.join(CASES)}\n"
+        f"计算方式: {', '.join(BACKENDS)}"
+    )
+    if len(sys.argv) < 2 or sys.argv[1] not in ("generate", "check"):
+        print(usage)
+        sys.exit(1)
+
+    names = sys.argv[2:]
+    available = CASES if sys.argv[1] == "generate" else BACKENDS
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        print(f"未知的名称: {', '.join(unknown)}\n{usage}")
+        sys.exit(1)
+
+    if sys.argv[1] == "generate":
+        generate(names or CASES)
+    elif not check(names or list(BACKENDS)):
+        sys.exit(1)